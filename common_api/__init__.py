@@ -1,11 +1,17 @@
-from .buffer_api import Buffer, FileBuffer, MemoryBuffer, WritableMemoryBuffer
+from .buffer_api import Buffer, FileBuffer, MappedFileBuffer, MemoryBuffer, SubBuffer, WritableMemoryBuffer
+from .binary_struct import binary_struct
+from .bit_reader import BitReader
+from .buffer_trace import BufferTracer
+from .compression import (ChunkedCompressedBuffer, CompressedChunk, ScratchBufferPool, StreamingDecompressionBuffer,
+                          decompress_many, decompress_stream)
 from .addon_info import PluginInfo, PropertyInfo, LoaderInfo
 from .textures import (Texture, PixelFormat, create_image_from_data, create_image_from_texture,
                        get_buffer_size_from_texture_format, get_uncompressed_pixel_format_variant,
-                       is_compressed_pixel_format, lz4_decompress, zstd_decompress)
+                       is_compressed_pixel_format, lz4_decompress, zstd_decompress, lz4_decompress_into,
+                       zstd_decompress_into)
 from .collections_api import get_or_create_collection, exclude_collection, find_layer_collection
 from .mesh_utils import (add_custom_normals, add_uv_layer, add_vertex_color_layer, add_weights,
-                         add_custom_normals_from_faces)
+                         add_custom_normals_from_faces, build_mesh, add_weights_from_vertices)
 from .material_utils import (create_material, new_material, load_image_from_path, create_texture_node, connect_nodes,
                              connect_nodes_group, clear_nodes, create_node, Nodes)
 from .common_types import Vector2, Vector3, Vector4
@@ -0,0 +1,329 @@
+import dataclasses
+import struct
+import sys
+from typing import Any, Optional, Type, TypeVar, Union
+
+import numpy as np
+
+from UniLoader.common_api.buffer_api import StructureArray, struct_format_to_dtype
+
+T = TypeVar("T")
+
+
+class Primitive:
+    """Fixed size scalar field."""
+
+    def __init__(self, fmt: str, dtype: str):
+        self.fmt = fmt
+        self.dtype = np.dtype(dtype)
+
+    def __repr__(self):
+        return f'Primitive({self.fmt!r})'
+
+
+uint8 = Primitive('B', 'u1')
+int8 = Primitive('b', 'i1')
+uint16 = Primitive('H', 'u2')
+int16 = Primitive('h', 'i2')
+uint32 = Primitive('I', 'u4')
+int32 = Primitive('i', 'i4')
+uint64 = Primitive('Q', 'u8')
+int64 = Primitive('q', 'i8')
+float16 = Primitive('e', 'f2')
+float32 = Primitive('f', 'f4')
+float64 = Primitive('d', 'f8')
+boolean = Primitive('?', '?')
+
+
+@dataclasses.dataclass(frozen=True)
+class Array:
+    """Array field. Count is either fixed or name of previously read field.
+
+    Fixed arrays of primitives are read as tuples, arrays with count from field are read as numpy arrays.
+    Arrays of Readable are read with Buffer.read_structure_array.
+    """
+    element: Any
+    count: Union[int, str]
+
+
+@dataclasses.dataclass(frozen=True)
+class FixedString:
+    """Zero padded string of fixed length."""
+    length: int
+
+
+@dataclasses.dataclass(frozen=True)
+class Padding:
+    """Skipped bytes. Field must be declared with field(default=None, init=False)."""
+    size: int
+
+
+class _CString:
+    """Zero terminated string."""
+
+    def __repr__(self):
+        return 'CString'
+
+
+CString = _CString()
+FourCC = FixedString(4)
+
+
+def _decode_string(data: bytes) -> str:
+    data = data.strip(b'\x00')
+    if b'\x00' in data:
+        data = data[:data.index(b'\x00')]
+    return data.decode('latin', errors='replace')
+
+
+def _record_to_object(data_class, record):
+    from_record = getattr(data_class, 'from_record', None)
+    if from_record is not None:
+        return from_record(record)
+    return data_class(*record.item())
+
+
+def _is_readable(tp) -> bool:
+    return hasattr(tp, 'from_buffer')
+
+
+def _fixed_format(tp) -> Optional[str]:
+    """Returns struct format of field if it can be merged into single struct, None otherwise."""
+    if isinstance(tp, Primitive):
+        return tp.fmt
+    if isinstance(tp, FixedString):
+        return f'{tp.length}s'
+    if isinstance(tp, Padding):
+        return f'{tp.size}x'
+    if isinstance(tp, Array) and isinstance(tp.element, Primitive) and isinstance(tp.count, int):
+        return f'{tp.count}{tp.element.fmt}'
+    return None
+
+
+def _record_dtype(tp) -> Optional[np.dtype]:
+    if isinstance(tp, Primitive):
+        return tp.dtype
+    if isinstance(tp, FixedString):
+        return np.dtype(f'S{tp.length}')
+    if _is_readable(tp):
+        record_dtype = getattr(tp, 'record_dtype', None)
+        if isinstance(record_dtype, str):
+            return struct_format_to_dtype(record_dtype)
+        return record_dtype
+    if isinstance(tp, Array) and isinstance(tp.count, int):
+        element_dtype = _record_dtype(tp.element)
+        if element_dtype is None:
+            return None
+        return np.dtype((element_dtype, (tp.count,)))
+    return None
+
+
+class _CodeBuilder:
+    def __init__(self):
+        self.namespace = {'_decode_string': _decode_string, '_record_to_object': _record_to_object,
+                          'StructureArray': StructureArray, 'np': np}
+
+    def constant(self, value) -> str:
+        name = f'_c{len(self.namespace)}'
+        self.namespace[name] = value
+        return name
+
+    def read_expression(self, tp, name: str) -> str:
+        """Expression reading single non mergeable value from buffer."""
+        if tp is CString:
+            return 'buffer.read_ascii_string()'
+        if isinstance(tp, Array):
+            count = tp.count if isinstance(tp.count, int) else f'f_{tp.count}'
+            if isinstance(tp.element, Primitive):
+                return f'buffer.read_array({self.constant(tp.element.dtype)}, {count})'
+            if _is_readable(tp.element):
+                return f'buffer.read_structure_array({count}, {self.constant(tp.element)})'
+            return f'[{self.read_expression(tp.element, name)} for _ in range({count})]'
+        if _is_readable(tp):
+            return f'{self.constant(tp)}.from_buffer(buffer)'
+        if isinstance(tp, Primitive):
+            return f'buffer.read_fmt({tp.fmt!r})[0]'
+        if isinstance(tp, FixedString):
+            return f'_decode_string(buffer.read({tp.length}))'
+        raise TypeError(f'Unsupported type {tp!r} of field {name!r}')
+
+    def write_statement(self, tp, value: str, name: str) -> str:
+        """Statement writing single non mergeable value to buffer."""
+        if tp is CString:
+            return f'buffer.write_ascii_string({value}, zero_terminated=True)'
+        if isinstance(tp, Array):
+            if isinstance(tp.element, Primitive):
+                return f'buffer.write_array(np.asarray({value}, {self.constant(tp.element.dtype)}))'
+            if _is_readable(tp.element):
+                return f'buffer.write_structure_array({value})'
+            return f'for _item in {value}: {self.write_statement(tp.element, "_item", name)}'
+        if _is_readable(tp):
+            return f'{value}.to_buffer(buffer)'
+        if isinstance(tp, Primitive):
+            return f'buffer.write_fmt({tp.fmt!r}, {value})'
+        if isinstance(tp, FixedString):
+            return f'buffer.write_ascii_string({value}, length={tp.length})'
+        raise TypeError(f'Unsupported type {tp!r} of field {name!r}')
+
+    def record_expression(self, tp, value: str) -> str:
+        """Expression converting record field into the same value from_buffer reads."""
+        if isinstance(tp, Primitive):
+            return f'{value}.item()'
+        if isinstance(tp, FixedString):
+            return f'_decode_string({value})'
+        if isinstance(tp, Array):
+            if isinstance(tp.element, Primitive):
+                return f'tuple({value}.tolist())'
+            if _is_readable(tp.element):
+                return f'StructureArray({value}, {self.constant(tp.element)})'
+            return f'[{self.record_expression(tp.element, "_item")} for _item in {value}]'
+        return f'_record_to_object({self.constant(tp)}, {value})'
+
+    def compile(self, name: str, source: str):
+        exec(source, self.namespace)
+        return self.namespace[name]
+
+
+def _schema_fields(cls) -> list[tuple[str, Any, bool]]:
+    module_globals = vars(sys.modules[cls.__module__])
+    schema = []
+    for field in dataclasses.fields(cls):
+        tp = field.type
+        if isinstance(tp, str):  # from __future__ import annotations
+            tp = eval(tp, module_globals, dict(vars(cls)))
+        schema.append((field.name, tp, field.init))
+    return schema
+
+
+def _generate_from_buffer(cls, schema):
+    builder = _CodeBuilder()
+    body = []
+    group: list[tuple[str, Any, str]] = []
+
+    def flush_group():
+        if not group:
+            return
+        fmt = ''.join(fmt for _, _, fmt in group)
+        structs = builder.constant({'<': struct.Struct('<' + fmt), '>': struct.Struct('>' + fmt)})
+        body.append(f'    _values = buffer.read_struct({structs}[buffer._endian])')
+        index = 0
+        for field_name, tp, _ in group:
+            if isinstance(tp, Padding):
+                continue
+            if isinstance(tp, Array):
+                body.append(f'    f_{field_name} = _values[{index}:{index + tp.count}]')
+                index += tp.count
+            elif isinstance(tp, FixedString):
+                body.append(f'    f_{field_name} = _decode_string(_values[{index}])')
+                index += 1
+            else:
+                body.append(f'    f_{field_name} = _values[{index}]')
+                index += 1
+        group.clear()
+
+    for field_name, tp, _ in schema:
+        fmt = _fixed_format(tp)
+        if fmt is not None:
+            group.append((field_name, tp, fmt))
+            continue
+        flush_group()
+        body.append(f'    f_{field_name} = {builder.read_expression(tp, field_name)}')
+    flush_group()
+
+    arguments = ', '.join(f'f_{field_name}' for field_name, tp, init in schema if init)
+    source = '\n'.join(['def from_buffer(cls, buffer):', *body, f'    return cls({arguments})'])
+    return builder.compile('from_buffer', source)
+
+
+def _generate_to_buffer(cls, schema):
+    builder = _CodeBuilder()
+    body = []
+    group: list[tuple[str, Any, str]] = []
+
+    def flush_group():
+        if not group:
+            return
+        fmt = ''.join(fmt for _, _, fmt in group)
+        structs = builder.constant({'<': struct.Struct('<' + fmt), '>': struct.Struct('>' + fmt)})
+        values = []
+        for field_name, tp, _ in group:
+            if isinstance(tp, Padding):
+                continue
+            if isinstance(tp, Array):
+                values.append(f'*self.{field_name}')
+            elif isinstance(tp, FixedString):
+                values.append(f"self.{field_name}.encode('latin')")
+            else:
+                values.append(f'self.{field_name}')
+        body.append(f'    buffer.write({structs}[buffer._endian].pack({", ".join(values)}))')
+        group.clear()
+
+    for field_name, tp, _ in schema:
+        fmt = _fixed_format(tp)
+        if fmt is not None:
+            group.append((field_name, tp, fmt))
+            continue
+        flush_group()
+        body.append(f'    {builder.write_statement(tp, f"self.{field_name}", field_name)}')
+    flush_group()
+
+    source = '\n'.join(['def to_buffer(self, buffer):', *(body or ['    pass'])])
+    return builder.compile('to_buffer', source)
+
+
+def _generate_from_record(cls, schema):
+    builder = _CodeBuilder()
+    arguments = []
+    for field_name, tp, init in schema:
+        if init:
+            arguments.append(builder.record_expression(tp, f'record[{field_name!r}]'))
+    source = f'def from_record(cls, record):\n    return cls({", ".join(arguments)})'
+    return builder.compile('from_record', source)
+
+
+def _build_record_dtype(schema) -> Optional[np.dtype]:
+    names, formats, offsets = [], [], []
+    offset = 0
+    for field_name, tp, _ in schema:
+        if isinstance(tp, Padding):
+            offset += tp.size
+            continue
+        field_dtype = _record_dtype(tp)
+        if field_dtype is None:
+            return None
+        names.append(field_name)
+        formats.append(field_dtype)
+        offsets.append(offset)
+        offset += field_dtype.itemsize
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': offset})
+
+
+def binary_struct(cls: Type[T]) -> Type[T]:
+    """Generates from_buffer and to_buffer for dataclass from field annotations.
+
+    Adjacent fixed size fields are read and written with single precompiled struct. If all fields are fixed size,
+    record_dtype and from_record are generated as well, so arrays of this class are read in bulk
+    by Buffer.read_structure_array.
+
+    Example:
+        @binary_struct
+        @dataclass
+        class Header:
+            magic: FourCC
+            version: uint32
+            bbox: Array(float32, 6)
+            bone_count: uint16
+            bones: Array(Bone, 'bone_count')
+            name: CString
+    """
+    if not dataclasses.is_dataclass(cls):
+        cls = dataclasses.dataclass(cls)
+    schema = _schema_fields(cls)
+    cls.from_buffer = classmethod(_generate_from_buffer(cls, schema))
+    if 'to_buffer' not in vars(cls):
+        cls.to_buffer = _generate_to_buffer(cls, schema)
+    record_dtype = _build_record_dtype(schema)
+    if record_dtype is not None:
+        cls.record_dtype = record_dtype
+        cls.from_record = classmethod(_generate_from_record(cls, schema))
+    return cls
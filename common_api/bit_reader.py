@@ -0,0 +1,131 @@
+import numpy as np
+
+from UniLoader.common_api.buffer_api import Buffer
+
+
+def _unsigned_dtype(width: int) -> np.dtype:
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if width <= np.dtype(dtype).itemsize * 8:
+            return np.dtype(dtype)
+    raise ValueError(f"Width {width} is too big")
+
+
+class BitReader:
+    """Reads bit packed values from buffer.
+
+    In LSB-first mode values are packed starting from lowest bit of each byte, in MSB-first mode from highest bit.
+    Partially consumed byte is kept by reader, underlying buffer is always positioned after it.
+    """
+
+    def __init__(self, buffer: Buffer, msb_first: bool = False):
+        self._buffer = buffer
+        self.msb_first = msb_first
+        self._current_byte = 0
+        self._bit_offset = 0  # Number of already consumed bits of current byte, 0 when there is no partial byte
+
+    @property
+    def buffer(self) -> Buffer:
+        return self._buffer
+
+    def tell_bits(self) -> int:
+        if self._bit_offset:
+            return (self._buffer.tell() - 1) * 8 + self._bit_offset
+        return self._buffer.tell() * 8
+
+    def align(self):
+        """Skips rest of partially consumed byte."""
+        self._bit_offset = 0
+
+    def _read_stream(self, bit_count: int) -> tuple[bytes, int]:
+        """Returns bytes containing next bit_count bits and bit offset of first bit in them."""
+        start = self._bit_offset
+        if start:
+            prefix = bytes((self._current_byte,))
+            byte_count = (start + bit_count + 7) // 8 - 1
+        else:
+            prefix = b''
+            byte_count = (bit_count + 7) // 8
+        data = self._buffer.read(byte_count)
+        if len(data) != byte_count:
+            raise BufferError(f"Not enough data in buffer to read {bit_count} bits")
+        stream = prefix + data
+        end = start + bit_count
+        if end % 8:
+            self._current_byte = stream[-1]
+            self._bit_offset = end % 8
+        else:
+            self._bit_offset = 0
+        return stream, start
+
+    def read_bits(self, count: int) -> int:
+        if count == 0:
+            return 0
+        stream, start = self._read_stream(count)
+        mask = (1 << count) - 1
+        if self.msb_first:
+            return (int.from_bytes(stream, 'big') >> (len(stream) * 8 - start - count)) & mask
+        return (int.from_bytes(stream, 'little') >> start) & mask
+
+    def read_signed_bits(self, count: int) -> int:
+        value = self.read_bits(count)
+        if count and value & (1 << (count - 1)):
+            value -= 1 << count
+        return value
+
+    def read_bool(self) -> bool:
+        return bool(self.read_bits(1))
+
+    def unpack_bits(self, count: int, width: int, signed: bool = False) -> np.ndarray:
+        """Reads count values of width bits each as array of smallest fitting integer type. Width is limited to 57."""
+        if not 0 < width <= 57:
+            raise ValueError(f"Width must be in 1..57 range, got {width}")
+        dtype = _unsigned_dtype(width)
+        if count == 0:
+            return np.zeros(0, dtype.str.replace('u', 'i') if signed else dtype)
+        stream, start = self._read_stream(count * width)
+        data = np.zeros(len(stream) + 8, np.uint8)
+        data[:len(stream)] = np.frombuffer(stream, np.uint8)
+        bit_offsets = start + np.arange(count, dtype=np.uint64) * np.uint64(width)
+        byte_offsets = (bit_offsets >> np.uint64(3)).astype(np.intp)
+        shifts = bit_offsets & np.uint64(7)
+        windows = np.lib.stride_tricks.sliding_window_view(data, 8)[byte_offsets]
+        if self.msb_first:
+            words = windows.view('>u8').ravel()
+            shifts = np.uint64(64 - width) - shifts
+        else:
+            words = windows.view('<u8').ravel()
+        values = (words >> shifts) & np.uint64((1 << width) - 1)
+        if signed:
+            sign = np.uint64(1 << (width - 1))
+            values = (values ^ sign).astype(np.int64) - np.int64(sign)
+            return values.astype(dtype.str.replace('u', 'i'))
+        return values.astype(dtype)
+
+    def read_varint_array(self, count: int, zigzag: bool = False) -> np.ndarray:
+        """Reads count LEB128 varints(up to 64 bit) from byte aligned position."""
+        self.align()
+        if count == 0:
+            return np.zeros(0, np.int64 if zigzag else np.uint64)
+        # Every varint has at least one byte, so reading one byte per missing varint never reads past the last one
+        # and nothing has to be seeked back, which works for forward-only streams as well
+        chunks = []
+        found = 0
+        while found < count:
+            chunk = np.frombuffer(self._buffer.read(count - found), np.uint8)
+            if not len(chunk):
+                raise BufferError(f"Not enough data in buffer to read {count} varints")
+            chunks.append(chunk)
+            found += np.count_nonzero(chunk < 0x80)
+        data = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+        ends = np.flatnonzero(data < 0x80)
+        used = len(data)
+        starts = np.empty(count, np.intp)
+        starts[0] = 0
+        starts[1:] = ends[:count - 1] + 1
+        groups = np.repeat(np.arange(count), np.diff(np.append(starts, used)))
+        positions = np.arange(used) - starts[groups]
+        parts = (data & 0x7F).astype(np.uint64) << (positions.astype(np.uint64) * np.uint64(7))
+        values = np.bitwise_or.reduceat(parts, starts)
+        if zigzag:
+            return (values >> np.uint64(1)).astype(np.int64) ^ -(values & np.uint64(1)).astype(np.int64)
+        return values
@@ -3,17 +3,87 @@ import binascii
 import contextlib
 import io
 import math
+import mmap
 import os
+import queue
+import re
 import struct
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from struct import calcsize, pack, unpack
-from typing import Optional, Protocol, Union, TypeVar, Type
+from struct import calcsize
+from typing import Callable, ClassVar, Optional, Protocol, Sequence, Union, TypeVar, Type
+
+import numpy as np
+
+DTypeLike = Union[np.dtype, type, str]
+
+_STRUCT_TO_NUMPY = {
+    'c': 'S1', '?': '?', 'b': 'i1', 'B': 'u1', 'h': 'i2', 'H': 'u2', 'i': 'i4', 'I': 'u4', 'l': 'i4', 'L': 'u4',
+    'q': 'i8', 'Q': 'u8', 'e': 'f2', 'f': 'f4', 'd': 'f8',
+}
+_STRUCT_TOKEN = re.compile(r'\s*(\d*)([xcbB?hHiIlLqQefds])')
+
+
+class _StructTable(dict):
+    """Precompiled structs for one byte order, compiled on first use of format."""
+
+    def __init__(self, endian: str):
+        super().__init__()
+        self.endian = endian
+
+    def __missing__(self, fmt: str) -> struct.Struct:
+        compiled = self[fmt] = struct.Struct(self.endian + fmt)
+        return compiled
+
+
+_STRUCT_TABLES = {'<': _StructTable('<'), '>': _StructTable('>')}
+_NULL_BYTE = re.compile(b'\x00')
+
+
+def _check_view_offset(view: memoryview, offset: int):
+    # Negative offsets would silently index from the end of the view
+    if offset < 0 or offset > len(view):
+        raise BufferError(f'Offset {offset} is out of bounds(0..{len(view)})')
+
+
+def struct_format_to_dtype(fmt: str) -> np.dtype:
+    """Converts struct format(without byte order prefix) into structured dtype with f0..fN fields."""
+    names, formats, offsets = [], [], []
+    offset = 0
+    for count, char in _STRUCT_TOKEN.findall(fmt):
+        count = int(count) if count else 1
+        if char == 'x':
+            offset += count
+            continue
+        if char == 's':
+            formats.append(f'S{count}')
+        elif count == 1:
+            formats.append(_STRUCT_TO_NUMPY[char])
+        else:
+            formats.append((_STRUCT_TO_NUMPY[char], (count,)))
+        names.append(f'f{len(names)}')
+        offsets.append(offset)
+        offset += calcsize('<' + (f'{count}{char}' if char == 's' else char * count))
+    if offset != calcsize('<' + fmt):
+        raise ValueError(f"Invalid struct format {fmt!r}")
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': offset})
 
 
 class Buffer(abc.ABC, io.RawIOBase):
     def __init__(self):
         io.RawIOBase.__init__(self)
-        self._endian = '<'
+        self._structs = _STRUCT_TABLES['<']
+        self._string_cache: Optional[dict[int, str]] = None
+
+    @property
+    def _endian(self) -> str:
+        return self._structs.endian
+
+    @_endian.setter
+    def _endian(self, value: str):
+        self._structs = _STRUCT_TABLES[value]
 
     @abc.abstractmethod
     def read(self, _size: int = -1) -> bytes:
@@ -51,16 +121,105 @@ class Buffer(abc.ABC, io.RawIOBase):
     def read_source1_string(self, entry):
         offset = self.read_int32()
         if offset:
-            with self.read_from_offset(entry + offset):
-                return self.read_ascii_string()
+            return self.read_string_at(entry + offset)
         else:
             return ""
 
     def read_source2_string(self):
         entry = self.tell()
         offset = self.read_int32()
-        with self.read_from_offset(entry + offset):
-            return self.read_ascii_string()
+        return self.read_string_at(entry + offset)
+
+    def enable_string_cache(self, enabled: bool = True):
+        """Caches zero terminated strings read with read_string_at/read_strings_at by their offset."""
+        self._string_cache = {} if enabled else None
+
+    def read_string_at(self, offset: int) -> str:
+        """Reads zero terminated string at given offset without moving current offset."""
+        cache = self._string_cache
+        if cache is not None and offset in cache:
+            return cache[offset]
+        buffer = bytearray()
+        chunk_size = 256
+        while True:
+            chunk = self.read_at(offset + len(buffer), chunk_size)
+            chunk_end = chunk.find(b'\x00')
+            if chunk_end >= 0:
+                buffer += chunk[:chunk_end]
+                break
+            buffer += chunk
+            if len(chunk) < chunk_size:
+                break
+            chunk_size = min(chunk_size * 2, 64 * 1024)
+        string = buffer.decode('latin', errors='replace')
+        if cache is not None:
+            cache[offset] = string
+        return string
+
+    def read_strings_at(self, offsets: Sequence[int]) -> list[str]:
+        """Reads zero terminated strings at given offsets, string table is read in single pass."""
+        if len(offsets) == 0:
+            return []
+        start = min(offsets)
+        last = max(offsets)
+        end = last + len(self.read_string_at(last))
+        table = self.read_at(start, end - start)
+        cache = self._string_cache if self._string_cache is not None else {}
+        strings = []
+        for offset in offsets:
+            string = cache.get(offset)
+            if string is None:
+                string_start = offset - start
+                string_end = table.find(b'\x00', string_start)
+                if string_end < 0:
+                    string_end = len(table)
+                string = cache[offset] = table[string_start:string_end].decode('latin', errors='replace')
+            strings.append(string)
+        return strings
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        """Reads size bytes at given offset without moving current offset."""
+        with self.read_from_offset(offset):
+            return self.read(size)
+
+    def unpack_at(self, fmt: str, offset: int) -> tuple:
+        """Unpacks struct format in buffer endianness at given offset without moving current offset."""
+        struct_ = self._structs[fmt]
+        data = self.read_at(offset, struct_.size)
+        return struct_.unpack(data)
+
+    def read_uint64_at(self, offset: int):
+        return self.unpack_at('Q', offset)[0]
+
+    def read_int64_at(self, offset: int):
+        return self.unpack_at('q', offset)[0]
+
+    def read_uint32_at(self, offset: int):
+        return self.unpack_at('I', offset)[0]
+
+    def read_int32_at(self, offset: int):
+        return self.unpack_at('i', offset)[0]
+
+    def read_uint16_at(self, offset: int):
+        return self.unpack_at('H', offset)[0]
+
+    def read_int16_at(self, offset: int):
+        return self.unpack_at('h', offset)[0]
+
+    def read_uint8_at(self, offset: int):
+        return self.unpack_at('B', offset)[0]
+
+    def read_int8_at(self, offset: int):
+        return self.unpack_at('b', offset)[0]
+
+    def read_hfloat_at(self, offset: int):
+        return self.unpack_at('e', offset)[0]
+
+    def read_float_at(self, offset: int):
+        return self.unpack_at('f', offset)[0]
+
+    def read_double_at(self, offset: int):
+        return self.unpack_at('d', offset)[0]
 
     @property
     @abc.abstractmethod
@@ -88,46 +247,81 @@ class Buffer(abc.ABC, io.RawIOBase):
         self.seek(size, io.SEEK_CUR)
 
     def read_fmt(self, fmt):
-        return unpack(self._endian + fmt, self.read(calcsize(self._endian + fmt)))
+        return self.read_struct(self._structs[fmt])
 
     def _read(self, fmt):
-        return unpack(self._endian + fmt, self.read(calcsize(self._endian + fmt)))[0]
+        return self.read_struct(self._structs[fmt])[0]
+
+    def read_struct(self, struct_: struct.Struct) -> tuple:
+        """Unpacks precompiled struct, byte order prefix of struct is used instead of buffer endianness."""
+        return struct_.unpack(self.read(struct_.size))
 
     def read_relative_offset32(self):
         return self.tell() + self.read_uint32()
 
     def read_uint64(self):
-        return self._read('Q')
+        return self.read_struct(self._structs['Q'])[0]
 
     def read_int64(self):
-        return self._read('q')
+        return self.read_struct(self._structs['q'])[0]
 
     def read_uint32(self):
-        return self._read('I')
+        return self.read_struct(self._structs['I'])[0]
 
     def read_int32(self):
-        return self._read('i')
+        return self.read_struct(self._structs['i'])[0]
 
     def read_uint16(self):
-        return self._read('H')
+        return self.read_struct(self._structs['H'])[0]
 
     def read_int16(self):
-        return self._read('h')
+        return self.read_struct(self._structs['h'])[0]
 
     def read_uint8(self):
-        return self._read('B')
+        return self.read_struct(self._structs['B'])[0]
 
     def read_int8(self):
-        return self._read('b')
+        return self.read_struct(self._structs['b'])[0]
 
     def read_hfloat(self):
-        return self._read('e')
+        return self.read_struct(self._structs['e'])[0]
 
     def read_float(self):
-        return self._read('f')
+        return self.read_struct(self._structs['f'])[0]
 
     def read_double(self):
-        return self._read('d')
+        return self.read_struct(self._structs['d'])[0]
+
+    def readinto(self, _b) -> int:
+        target = np.frombuffer(_b, np.uint8)
+        data = self.read(target.nbytes)
+        target[:len(data)] = np.frombuffer(data, np.uint8)
+        return len(data)
+
+    def _array_dtype(self, dtype: DTypeLike) -> np.dtype:
+        return np.dtype(dtype).newbyteorder(self._endian)
+
+    def read_array(self, dtype: DTypeLike, count: int) -> np.ndarray:
+        """Reads count elements of dtype in buffer endianness."""
+        array = np.empty(count, self._array_dtype(dtype))
+        read = self.readinto(array)
+        if read != array.nbytes:
+            raise BufferError(f"Not enough data in buffer to read {array.nbytes} bytes, got {read}")
+        return array
+
+    def peek_array(self, offset: int, dtype: DTypeLike, count: int) -> np.ndarray:
+        """Reads count elements of dtype at given offset without moving current offset."""
+        dtype = self._array_dtype(dtype)
+        data = self.read_at(offset, dtype.itemsize * count)
+        if len(data) != dtype.itemsize * count:
+            raise BufferError(f"Not enough data in buffer to read {dtype.itemsize * count} bytes at {offset}")
+        return np.frombuffer(data, dtype)
+
+    def read_record_array(self, count: int, record_dtype: Union[np.dtype, str]) -> np.ndarray:
+        """Reads count fixed size records described by structured dtype or struct format as structured array."""
+        if isinstance(record_dtype, str):
+            record_dtype = struct_format_to_dtype(record_dtype)
+        return self.read_array(record_dtype, count)
 
     def read_padded_ascii_string(self):
         string = self.read_ascii_string()
@@ -144,19 +338,18 @@ class Buffer(abc.ABC, io.RawIOBase):
             return buffer.decode('latin', errors='replace')
 
         buffer = bytearray()
-
+        chunk_size = 256
         while True:
-            chunk = self.read(min(32, self.remaining()))
-            if chunk:
-                chunk_end = chunk.find(b'\x00')
-            else:
-                chunk_end = 0
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return buffer.decode('latin', errors='replace')
+            chunk_end = chunk.find(b'\x00')
             if chunk_end >= 0:
                 buffer += chunk[:chunk_end]
                 self.seek(-(len(chunk) - chunk_end - 1), io.SEEK_CUR)
                 return buffer.decode('latin', errors='replace')
-            else:
-                buffer += chunk
+            buffer += chunk
+            chunk_size = min(chunk_size * 2, 64 * 1024)
 
     def read_varint(self):
         value = 0
@@ -173,7 +366,7 @@ class Buffer(abc.ABC, io.RawIOBase):
         return self.read_ascii_string(4)
 
     def write_fmt(self, fmt: str, *values):
-        self.write(pack(self._endian + fmt, *values))
+        self.write(self._structs[fmt].pack(*values))
 
     def write_uint64(self, value):
         self.write_fmt('Q', value)
@@ -206,16 +399,32 @@ class Buffer(abc.ABC, io.RawIOBase):
         self.write_fmt('d', value)
 
     def write_ascii_string(self, string, zero_terminated=False, length=-1):
-        pos = self.tell()
-        for c in string:
-            self.write(c.encode('ascii'))
+        encoded = string.encode('ascii')
         if zero_terminated:
-            self.write(b'\x00')
-        elif length != -1:
-            to_fill = length - (self.tell() - pos)
-            if to_fill > 0:
-                for _ in range(to_fill):
-                    self.write_uint8(0)
+            encoded += b'\x00'
+        elif length != -1 and len(encoded) < length:
+            encoded += bytes(length - len(encoded))
+        self.write(encoded)
+
+    def write_zeros(self, size: int):
+        if size > 0:
+            self.write(bytes(size))
+
+    def write_array(self, array: np.ndarray):
+        """Writes array in buffer endianness with single write."""
+        array = np.asarray(array)
+        array = np.ascontiguousarray(array, array.dtype.newbyteorder(self._endian))
+        self.write(array.reshape(-1).view(np.uint8))
+
+    def write_structure_array(self, records: Union[np.ndarray, 'StructureArray', Sequence['Writable']]):
+        """Writes structured array with single write, or calls to_buffer of each record."""
+        if isinstance(records, StructureArray):
+            records = records.records
+        if isinstance(records, np.ndarray):
+            self.write_array(records)
+            return
+        for record in records:
+            record.to_buffer(self)
 
     def write_fourcc(self, fourcc):
         self.write_ascii_string(fourcc)
@@ -229,10 +438,10 @@ class Buffer(abc.ABC, io.RawIOBase):
             return self.read_uint16()
 
     def set_big_endian(self):
-        self._endian = '>'
+        self._structs = _STRUCT_TABLES['>']
 
     def set_little_endian(self):
-        self._endian = '<'
+        self._structs = _STRUCT_TABLES['<']
 
     def __bool__(self):
         return self.tell() < self.size()
@@ -240,9 +449,19 @@ class Buffer(abc.ABC, io.RawIOBase):
     def slice(self, offset: Optional[int] = None, size: int = -1) -> 'Buffer':
         raise NotImplementedError
 
+    def sub_buffer(self, offset: Optional[int] = None, size: int = -1) -> 'SubBuffer':
+        """Returns lazy window into this buffer, nothing is read until window is read from."""
+        if offset is None:
+            offset = self.tell()
+        if size == -1:
+            size = self.size() - offset
+        return SubBuffer(self, offset, size)
+
     def read_structure_array(self, count, data_class: Type['Readable']):
         if count == 0:
             return []
+        if getattr(data_class, 'record_dtype', None) is not None:
+            return StructureArray(self.read_record_array(count, data_class.record_dtype), data_class)
         object_list = []
         for _ in range(count):
             obj = data_class.from_buffer(self)
@@ -264,16 +483,54 @@ class MemoryBuffer(Buffer):
     def size(self):
         return len(self._buffer)
 
-    def _read(self, fmt: str):
-        data = struct.unpack_from(self._endian + fmt, self._buffer, self._offset)
-        self._offset += struct.calcsize(self._endian + fmt)
-        return data[0]
-
-    def read_fmt(self, fmt):
-        data = struct.unpack_from(self._endian + fmt, self._buffer, self._offset)
-        self._offset += struct.calcsize(self._endian + fmt)
+    def read_struct(self, struct_: struct.Struct) -> tuple:
+        data = struct_.unpack_from(self._buffer, self._offset)
+        self._offset += struct_.size
         return data
 
+    def read_array(self, dtype: DTypeLike, count: int) -> np.ndarray:
+        array = self.peek_array(self._offset, dtype, count)
+        self._offset += array.nbytes
+        return array
+
+    def peek_array(self, offset: int, dtype: DTypeLike, count: int) -> np.ndarray:
+        _check_view_offset(self._buffer, offset)
+        dtype = self._array_dtype(dtype)
+        if offset + dtype.itemsize * count > self.size():
+            raise BufferError(f"Not enough data in buffer to read {dtype.itemsize * count} bytes at {offset}")
+        return np.frombuffer(self._buffer, dtype, count, offset)
+
+    def read_ascii_string(self, length=None):
+        if length is not None:
+            return super().read_ascii_string(length)
+        start = self._offset
+        match = _NULL_BYTE.search(self._buffer, start)
+        if match is None:
+            end = self._offset = self.size()
+        else:
+            end = match.start()
+            self._offset = match.end()
+        return str(self._buffer[start:end], 'latin', 'replace')
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        _check_view_offset(self._buffer, offset)
+        return self._buffer[offset:offset + size].tobytes()
+
+    def unpack_at(self, fmt: str, offset: int) -> tuple:
+        _check_view_offset(self._buffer, offset)
+        return self._structs[fmt].unpack_from(self._buffer, offset)
+
+    def read_string_at(self, offset: int) -> str:
+        cache = self._string_cache
+        if cache is not None and offset in cache:
+            return cache[offset]
+        _check_view_offset(self._buffer, offset)
+        match = _NULL_BYTE.search(self._buffer, offset)
+        string = str(self._buffer[offset:match.start() if match else self.size()], 'latin', 'replace')
+        if cache is not None:
+            cache[offset] = string
+        return string
+
     def write(self, _b: Union[bytes, bytearray]) -> Optional[int]:
         if self._offset + len(_b) > self.size():
             raise BufferError(f"Not enough space left({self.remaining()}) in buffer to write {len(_b)} bytes")
@@ -287,7 +544,7 @@ class MemoryBuffer(Buffer):
             self._offset += len(data)
             return data.tobytes()
         data = self._buffer[self._offset:self._offset + _size]
-        self._offset += _size
+        self._offset += len(data)
         return data.tobytes()
 
     def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
@@ -348,6 +605,16 @@ class WritableMemoryBuffer(io.BytesIO, Buffer):
             return MemoryBuffer(self.data[offset:])
         return MemoryBuffer(self.data[offset:offset + size])
 
+    def read_at(self, offset: int, size: int) -> bytes:
+        with self.getbuffer() as view:
+            _check_view_offset(view, offset)
+            return view[offset:offset + size].tobytes()
+
+    def unpack_at(self, fmt: str, offset: int) -> tuple:
+        with self.getbuffer() as view:
+            _check_view_offset(view, offset)
+            return self._structs[fmt].unpack_from(view, offset)
+
     def tell(self) -> int:
         return io.BytesIO.tell(self)
 
@@ -358,15 +625,337 @@ class WritableMemoryBuffer(io.BytesIO, Buffer):
         return f'<WritableMemoryBuffer {self.tell()}/{self.size()}>'
 
 
-class FileBuffer(io.FileIO, Buffer):
+class SubBuffer(Buffer):
+    """Read-only window(offset, size) into parent buffer with its own offset.
+
+    Reads are forwarded to parent with positional reads, so parent offset is never changed and
+    nested windows are flattened to reference the root buffer.
+    """
+
+    def __init__(self, parent: Buffer, offset: int, size: int):
+        super().__init__()
+        if isinstance(parent, SubBuffer):
+            offset += parent._base
+            parent = parent._parent
+        if offset < 0 or size < 0 or offset + size > parent.size():
+            raise BufferError(f"Window {offset}:{offset + size} is out of parent bounds({parent.size()})")
+        self._parent = parent
+        self._base = offset
+        self._size = size
+        self._offset = 0
+        self._structs = parent._structs
+
+    @property
+    def data(self) -> bytes:
+        return self._parent.read_at(self._base, self._size)
+
+    def size(self):
+        return self._size
+
+    def read(self, _size: int = -1) -> bytes:
+        available = self._size - self._offset
+        size = available if _size is None or _size < 0 else min(_size, available)
+        data = self._parent.read_at(self._base + self._offset, max(size, 0))
+        self._offset += len(data)
+        return data
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        if offset < 0 or offset > self._size:
+            raise BufferError(f'Offset {offset} is out of bounds(0..{self._size})')
+        size = min(size, self._size - offset)
+        return self._parent.read_at(self._base + offset, max(size, 0))
+
+    def write(self, _b: Union[bytes, bytearray]) -> int:
+        raise io.UnsupportedOperation("SubBuffer is read-only")
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._offset + offset
+        elif whence == io.SEEK_END:
+            position = self._size - offset
+        else:
+            raise ValueError("Invalid whence argument")
 
+        if position < 0 or position > self._size:
+            raise BufferError('Offset is out of bounds')
 
+        self._offset = position
+        return self._offset
+
+    def tell(self) -> int:
+        return self._offset
+
+    def slice(self, offset: Optional[int] = None, size: int = -1) -> 'Buffer':
+        return self.sub_buffer(offset, size)
+
+    def __repr__(self) -> str:
+        return f'<SubBuffer {self._base}:{self._base + self._size} of {self._parent!r} {self.tell()}/{self.size()}>'
+
+
+class _PageCache:
+    """LRU cache of fixed size file pages."""
+
+    def __init__(self, read_page: Callable[[int, int], bytes], page_size: int, max_pages: int):
+        self._read_page = read_page
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages: OrderedDict[int, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_page(self, index: int) -> bytes:
+        with self._lock:
+            page = self.pages.get(index)
+            if page is not None:
+                self.pages.move_to_end(index)
+                self.hits += 1
+                return page
+            self.misses += 1
+        page = self._read_page(index * self.page_size, self.page_size)
+        with self._lock:
+            self.pages[index] = page
+            if len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+        return page
+
+    def read(self, offset: int, size: int) -> bytes:
+        page_size = self.page_size
+        index, start = divmod(offset, page_size)
+        if start + size <= page_size:
+            return self.get_page(index)[start:start + size]
+        chunks = []
+        while size > 0:
+            chunk = self.get_page(index)[start:start + size]
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+            index += 1
+            start = 0
+        return b''.join(chunks)
+
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'pages': len(self.pages), 'page_size': self.page_size}
+
+
+class _Readahead:
+    """Background thread prefetching next blocks of sequential scan into bounded queue."""
+
+    def __init__(self, read_block: Callable[[int, int], bytes], offset: int, block_size: int, max_blocks: int):
+        self._read_block = read_block
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.active = True
+        self.blocks = 0
+        self.prefetched_bytes = 0
+        self.prefetch_time = 0.0  # Time spent by reader thread on blocks that were consumed
+        self.wait_time = 0.0  # Time consumer was blocked waiting for blocks
+        self.restarts = 0
+        self._block_offset = offset
+        self._block = b''
+        self._previous_block = b''  # Kept so short seeks back over block boundary(peeks, string reads) are served
+        self._eof = False
+        self._queue: Optional[queue.Queue] = None
+        self._stop_event: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start(offset)
+
+    def _start(self, offset: int):
+        self._queue = queue.Queue(self.max_blocks)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._worker, args=(offset, self._queue, self._stop_event),
+                                        name='FileBuffer readahead', daemon=True)
+        self._thread.start()
+
+    def _worker(self, offset: int, blocks: queue.Queue, stop_event: threading.Event):
+        while not stop_event.is_set():
+            start = time.perf_counter()
+            try:
+                data = self._read_block(offset, self.block_size)
+            except BaseException as ex:
+                item = (offset, ex, 0.0)
+            else:
+                item = (offset, data, time.perf_counter() - start)
+            while not stop_event.is_set():
+                try:
+                    blocks.put(item, timeout=0.05)
+                    break
+                except queue.Full:
+                    pass
+            if not isinstance(item[1], bytes) or len(item[1]) < self.block_size:
+                return  # Error or end of file
+            offset += len(item[1])
+
+    def _next_block(self) -> bytes:
+        start = time.perf_counter()
+        offset, data, duration = self._queue.get()
+        self.wait_time += time.perf_counter() - start
+        if isinstance(data, BaseException):
+            self.stop()
+            raise data
+        self.blocks += 1
+        self.prefetched_bytes += len(data)
+        self.prefetch_time += duration
+        self._previous_block = self._block
+        self._block_offset = offset
+        self._block = data
+        self._eof = len(data) < self.block_size
+        return data
+
+    def _restart(self, offset: int):
+        self.stop()
+        self.active = True
+        self.restarts += 1
+        self._block_offset = offset
+        self._block = b''
+        self._previous_block = b''
+        self._eof = False
+        self._start(offset)
+
+    def stop(self):
+        self.active = False
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def read(self, offset: int, size: int) -> bytes:
+        previous_offset = self._block_offset - len(self._previous_block)
+        if offset < previous_offset:
+            # Seek back past retained blocks, sequential scan is over
+            self.stop()
+        if not self.active:
+            return self._read_block(offset, size)
+        window_end = self._block_offset + len(self._block) + self.block_size * self.max_blocks
+        if offset >= window_end:
+            self._restart(offset)
+        chunks = []
+        if offset < self._block_offset:
+            start = offset - previous_offset
+            chunk = self._previous_block[start:start + size]
+            chunks.append(chunk)
+            offset += len(chunk)
+            size -= len(chunk)
+        while size > 0:
+            start = offset - self._block_offset
+            if start >= len(self._block):
+                if self._eof or not self._next_block():
+                    break
+                continue
+            chunk = self._block[start:start + size]
+            chunks.append(chunk)
+            offset += len(chunk)
+            size -= len(chunk)
+        return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+
+    def stats(self) -> dict[str, Union[int, float, bool]]:
+        return {'active': self.active, 'blocks': self.blocks, 'prefetched_bytes': self.prefetched_bytes,
+                'prefetch_time': self.prefetch_time, 'wait_time': self.wait_time,
+                'saved_time': max(self.prefetch_time - self.wait_time, 0.0), 'restarts': self.restarts}
+
+
+class FileBuffer(io.FileIO, Buffer):
 
     def __init__(self, file: Union[str, Path, int], mode: str = 'r', closefd: bool = True, opener=None) -> None:
         io.FileIO.__init__(self, file, mode, closefd, opener)
         Buffer.__init__(self)
         self._cached_size = None
         self._is_read_only = mode == "r" or mode == "rb"
+        self._page_cache: Optional[_PageCache] = None
+        self._readahead: Optional[_Readahead] = None
+        self._position = 0  # Used instead of OS file position while page cache or readahead is enabled
+        self._lock = threading.Lock()  # Guards OS file position on platforms without pread
+
+    def enable_page_cache(self, page_size: int = 64 * 1024, max_pages: int = 64):
+        """Serves reads from LRU cache of file pages. Only supported for read-only files."""
+        if not self._is_read_only:
+            raise ValueError("Page cache is only supported for read-only files")
+        if self._uses_file_position():
+            self._position = io.FileIO.tell(self)
+        self._page_cache = _PageCache(self._read_raw_at, page_size, max_pages)
+
+    def disable_page_cache(self):
+        if self._page_cache is not None:
+            self._page_cache = None
+            if self._uses_file_position():
+                io.FileIO.seek(self, self._position)
+
+    @property
+    def cache_stats(self) -> Optional[dict[str, int]]:
+        if self._page_cache is None:
+            return None
+        return self._page_cache.stats()
+
+    def enable_readahead(self, block_size: int = 256 * 1024, max_blocks: int = 4):
+        """Prefetches next max_blocks blocks on background thread while sequential reads are parsed.
+
+        Seeks back within last two blocks(peeks, string reads) are served from memory, readahead turns itself off
+        after seeking back further. Only supported for read-only files.
+        """
+        if not self._is_read_only:
+            raise ValueError("Readahead is only supported for read-only files")
+        self.disable_readahead()
+        if self._uses_file_position():
+            self._position = io.FileIO.tell(self)
+        self._readahead = _Readahead(self._read_raw_at, self._position, block_size, max_blocks)
+
+    def disable_readahead(self):
+        if self._readahead is not None:
+            self._readahead.stop()
+            self._readahead = None
+            if self._uses_file_position():
+                io.FileIO.seek(self, self._position)
+
+    @property
+    def readahead_stats(self) -> Optional[dict[str, Union[int, float, bool]]]:
+        """Readahead statistics, saved_time is time spent on reading blocks minus time spent waiting for them."""
+        if self._readahead is None:
+            return None
+        return self._readahead.stats()
+
+    def _uses_file_position(self) -> bool:
+        return self._page_cache is None and self._readahead is None
+
+    def _read_raw_at(self, offset: int, size: int) -> bytes:
+        if hasattr(os, 'pread'):
+            return os.pread(self.fileno(), size, offset)
+        with self._lock:
+            if not self._uses_file_position():
+                io.FileIO.seek(self, offset)
+                return io.FileIO.read(self, size)
+            position = io.FileIO.tell(self)
+            io.FileIO.seek(self, offset)
+            data = io.FileIO.read(self, size)
+            io.FileIO.seek(self, position)
+            return data
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        cache = self._page_cache
+        if cache is None or size > cache.page_size * 4:
+            # Bulk reads bypass the cache to not evict all pages
+            return self._read_raw_at(offset, size)
+        return cache.read(offset, size)
+
+    def read(self, _size: int = -1) -> bytes:
+        if self._uses_file_position():
+            return io.FileIO.read(self, _size)
+        offset = self._position
+        available = max(self.size() - offset, 0)
+        size = available if _size is None or _size < 0 else min(_size, available)
+        if self._readahead is not None and self._readahead.active:
+            data = self._readahead.read(offset, size)
+        else:
+            data = self.read_at(offset, size)
+        self._position += len(data)
+        return data
+
+    def readinto(self, _b) -> int:
+        if self._uses_file_position():
+            return io.FileIO.readinto(self, _b)
+        return Buffer.readinto(self, _b)
 
     def size(self):
         if self._is_read_only:
@@ -402,10 +991,63 @@ class FileBuffer(io.FileIO, Buffer):
             return MemoryBuffer(self.read(size))
 
     def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
-        return io.FileIO.seek(self, offset, whence)
+        if self._uses_file_position():
+            return io.FileIO.seek(self, offset, whence)
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size() + offset
+        else:
+            raise ValueError("Invalid whence argument")
+        if position < 0:
+            raise OSError(22, "Invalid argument")
+        self._position = position
+        return position
 
     def tell(self) -> int:
-        return io.FileIO.tell(self)
+        if self._uses_file_position():
+            return io.FileIO.tell(self)
+        return self._position
+
+    def close(self) -> None:
+        if self._readahead is not None:
+            self._readahead.stop()
+        io.FileIO.close(self)
+
+
+class MappedFileBuffer(MemoryBuffer):
+    """Read-only memory mapped file. Slices and data are views over the mapping, nothing is copied."""
+
+    def __init__(self, file: Union[str, Path]):
+        self._file = open(file, 'rb')
+        self.name = self._file.name
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            super().__init__(self._mmap)
+        else:
+            # mmap can't map empty files
+            self._mmap = None
+            super().__init__(b'')
+
+    def __repr__(self) -> str:
+        return f'<MappedFileBuffer: {self.name!r} {self.tell()}/{self.size()}>'
+
+    def close(self) -> None:
+        if self._buffer is not None:
+            self._buffer.release()
+        super().close()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Slices are still referencing the mapping, it will be unmapped once they are gone
+                pass
+            self._mmap = None
+        self._file.close()
+
 
 T = TypeVar("T")
 
@@ -416,4 +1058,67 @@ class Readable(Protocol):
         ...
 
 
-__all__ = ['Buffer', 'MemoryBuffer', 'WritableMemoryBuffer', 'FileBuffer', 'Readable']
+class Writable(Protocol):
+    def to_buffer(self, buffer: Buffer) -> None:
+        ...
+
+
+class FixedReadable(Readable, Protocol):
+    """Readable with fixed size layout, read in bulk by Buffer.read_structure_array.
+
+    Objects are created from records with from_record classmethod if present, otherwise record fields are passed
+    to the constructor in order.
+    """
+    record_dtype: ClassVar[Union[np.dtype, str]]  # Structured dtype or struct format without byte order
+
+
+class StructureArray(Sequence[T]):
+    """Sequence over structured array of records that creates objects on access."""
+
+    def __init__(self, records: np.ndarray, data_class: Type[T]):
+        self.records = records
+        self.data_class = data_class
+        self._from_record = getattr(data_class, 'from_record', None)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return StructureArray(self.records[item], self.data_class)
+        record = self.records[item]
+        if self._from_record is not None:
+            return self._from_record(record)
+        return self.data_class(*record.item())
+
+    def __repr__(self) -> str:
+        return f'<StructureArray {self.data_class.__name__}[{len(self)}]>'
+
+
+__all__ = ['Buffer', 'MemoryBuffer', 'WritableMemoryBuffer', 'FileBuffer', 'MappedFileBuffer', 'SubBuffer', 'Readable', 'Writable',
+           'FixedReadable', 'StructureArray', 'struct_format_to_dtype']
+
+
+if __name__ == '__main__':
+    import tempfile
+    import timeit
+
+    _count = 100000
+    _data = bytes(4 * _count)
+    with tempfile.TemporaryDirectory() as tmp:
+        _path = Path(tmp) / 'bench.bin'
+        _path.write_bytes(_data)
+        for _factory in (lambda: MemoryBuffer(_data), lambda: FileBuffer(_path)):
+            for _big_endian in (False, True):
+                with _factory() as _buffer:
+                    if _big_endian:
+                        _buffer.set_big_endian()
+
+                    def _bench():
+                        _buffer.seek(0)
+                        for _ in range(_count):
+                            _buffer.read_uint32()
+
+                    _time = min(timeit.repeat(_bench, number=1, repeat=5))
+                    print(f'{type(_buffer).__name__:<14} {"BE" if _big_endian else "LE"} read_uint32: '
+                          f'{_time / _count * 1e9:.1f} ns/call')
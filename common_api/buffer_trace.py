@@ -0,0 +1,274 @@
+import bisect
+import functools
+import inspect
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from UniLoader.common_api.buffer_api import Buffer
+
+_CURSOR_READS = ('read', 'readinto', 'read_struct', 'read_array', 'read_ascii_string')
+_POSITIONAL_READS = ('read_at', 'unpack_at', 'peek_array', 'read_string_at')
+_TRACED_METHODS = _CURSOR_READS + _POSITIONAL_READS + ('write', 'seek')
+
+
+def _all_subclasses(cls) -> list[type]:
+    subclasses = []
+    for subclass in cls.__subclasses__():
+        subclasses.append(subclass)
+        subclasses.extend(_all_subclasses(subclass))
+    return list(dict.fromkeys(subclasses))
+
+
+def _size_bucket(size: int) -> int:
+    return 0 if size <= 0 else 1 << (size - 1).bit_length()
+
+
+def _call_arguments(signature: Optional[inspect.Signature], buffer: Buffer, args: tuple, kwargs: dict) -> tuple:
+    """Returns arguments of call without self in declaration order, keyword arguments included."""
+    if not kwargs:
+        return args
+    if signature is None:
+        raise TypeError("Can't bind keyword arguments without signature")
+    return tuple(signature.bind(buffer, *args, **kwargs).arguments.values())[1:]
+
+
+class _ReadRanges:
+    """Sorted disjoint [start, end) byte ranges already read from single buffer."""
+
+    def __init__(self):
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+
+    def add(self, start: int, end: int) -> bool:
+        """Adds range, returns True if it overlaps bytes that were read before."""
+        if end <= start:
+            return False
+        first = bisect.bisect_left(self.ends, start)  # Ranges touching or overlapping new one
+        last = bisect.bisect_right(self.starts, end)
+        overlaps = any(self.starts[index] < end and start < self.ends[index] for index in range(first, last))
+        if first < last:
+            start = min(start, self.starts[first])
+            end = max(end, self.ends[last - 1])
+        self.starts[first:last] = [start]
+        self.ends[first:last] = [end]
+        return overlaps
+
+
+@dataclass(slots=True)
+class AccessStats:
+    """Access statistics of single Buffer class."""
+    reads: int = 0
+    bytes_read: int = 0
+    rereads: int = 0  # Reads overlapping bytes that were already read before
+    writes: int = 0
+    bytes_written: int = 0
+    seeks: int = 0
+    backward_seeks: int = 0
+    read_sizes: Counter = field(default_factory=Counter)  # Histogram of read sizes rounded up to power of two
+
+    def to_dict(self) -> dict:
+        return {
+            'reads': self.reads, 'bytes_read': self.bytes_read, 'rereads': self.rereads,
+            'writes': self.writes, 'bytes_written': self.bytes_written,
+            'seeks': self.seeks, 'backward_seeks': self.backward_seeks,
+            'read_sizes': {f'<={size}': count for size, count in sorted(self.read_sizes.items())},
+        }
+
+
+class BufferTracer:
+    """Records access patterns of all Buffer subclasses while active.
+
+    Buffer methods are patched only inside of with block, so there is no overhead when tracing is not used.
+
+    Example:
+        with BufferTracer() as tracer:
+            model = Model.from_buffer(FileBuffer(path))
+        tracer.save_json("access.json")
+        tracer.save_chrome_trace("access_trace.json")  # Open in chrome://tracing or ui.perfetto.dev
+    """
+
+    def __init__(self, record_call_sites: bool = True, max_events: int = 100000):
+        self.record_call_sites = record_call_sites
+        self.max_events = max_events
+        self.stats: dict[str, AccessStats] = {}
+        self.call_sites: Counter = Counter()
+        self.call_site_bytes: Counter = Counter()
+        self.events: list[tuple] = []
+        # Per buffer (token, read ranges), tokens are used instead of ids as ids are reused after buffer is freed
+        self._buffers: weakref.WeakKeyDictionary[Buffer, tuple[int, _ReadRanges]] = weakref.WeakKeyDictionary()
+        self._tokens = itertools.count()
+        self._patched: list[tuple[type, str, bool, object]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._start_time = 0.0
+        self._skip_files = {os.path.normcase(os.path.abspath(module.__file__)) for module in
+                            (sys.modules[Buffer.__module__], sys.modules[__name__])}
+
+    def __enter__(self) -> 'BufferTracer':
+        self._start_time = time.perf_counter()
+        patches = []
+        for cls in _all_subclasses(Buffer):
+            for name in _TRACED_METHODS:
+                original = getattr(cls, name, None)
+                if original is not None and not getattr(original, '__isabstractmethod__', False):
+                    patches.append((cls, name, name in vars(cls), original))
+        for cls, name, own, original in patches:
+            setattr(cls, name, self._wrap(name, original))
+        self._patched = patches
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for cls, name, own, original in self._patched:
+            if own:
+                setattr(cls, name, original)
+            else:
+                delattr(cls, name)
+        self._patched = []
+
+    def _call_site(self) -> str:
+        frame = sys._getframe(3)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename != '<string>' and os.path.normcase(os.path.abspath(filename)) not in self._skip_files:
+                return f'{filename}:{frame.f_lineno} ({frame.f_code.co_name})'
+            frame = frame.f_back
+        return '<unknown>'
+
+    def _wrap(self, name: str, original):
+        tracer = self
+        positional = name in _POSITIONAL_READS
+        try:
+            signature = inspect.signature(original)
+        except (TypeError, ValueError):  # Some builtin io methods have no signature
+            signature = None
+
+        @functools.wraps(original)
+        def traced(buffer, *args, **kwargs):
+            active = tracer._local.__dict__.setdefault('active', set())
+            if id(buffer) in active:
+                return original(buffer, *args, **kwargs)
+            active.add(id(buffer))
+            try:
+                # Tracer must never raise into traced code, calls it can't make sense of are not recorded
+                try:
+                    arguments = _call_arguments(signature, buffer, args, kwargs)
+                    if positional:
+                        position = arguments[1] if name == 'unpack_at' else arguments[0]
+                    else:
+                        position = buffer.tell()
+                except Exception:
+                    arguments = None
+                start = time.perf_counter()
+                result = original(buffer, *args, **kwargs)
+                duration = time.perf_counter() - start
+                if arguments is not None:
+                    try:
+                        tracer._record(buffer, name, position, arguments, result, start, duration)
+                    except Exception:
+                        pass
+                return result
+            finally:
+                active.discard(id(buffer))
+
+        return traced
+
+    def _record(self, buffer: Buffer, name: str, position: int, args: tuple, result, start: float, duration: float):
+        call_site = self._call_site() if self.record_call_sites else None
+        with self._lock:
+            stats = self.stats.get(type(buffer).__name__)
+            if stats is None:
+                stats = self.stats[type(buffer).__name__] = AccessStats()
+            state = self._buffers.get(buffer)
+            if state is None:
+                state = self._buffers[buffer] = (next(self._tokens), _ReadRanges())
+            token, read_ranges = state
+            if name == 'seek':
+                size = 0
+                stats.seeks += 1
+                if result < position:
+                    stats.backward_seeks += 1
+            elif name == 'write':
+                size = memoryview(args[0]).nbytes
+                stats.writes += 1
+                stats.bytes_written += size
+            else:
+                size = self._read_size(buffer, name, args, result)
+                stats.reads += 1
+                stats.bytes_read += size
+                stats.read_sizes[_size_bucket(size)] += 1
+                if read_ranges.add(position, position + size):
+                    stats.rereads += 1
+                if call_site is not None:
+                    self.call_sites[call_site] += 1
+                    self.call_site_bytes[call_site] += size
+            if len(self.events) < self.max_events:
+                self.events.append((start, duration, name, type(buffer).__name__, token, position, size,
+                                    threading.get_ident()))
+
+    @staticmethod
+    def _read_size(buffer: Buffer, name: str, args: tuple, result) -> int:
+        if isinstance(result, (bytes, bytearray, memoryview)):
+            return len(result)
+        if isinstance(result, np.ndarray):
+            return result.nbytes
+        if isinstance(result, str):
+            if name == 'read_ascii_string' and args and args[0] is not None:
+                return args[0]
+            return len(result) + 1  # Zero terminator
+        if name == 'read_struct':
+            return args[0].size
+        if name == 'unpack_at':
+            return buffer._structs[args[0]].size
+        if isinstance(result, int):  # readinto
+            return result
+        return 0
+
+    def hottest_call_sites(self, count: int = 10) -> list[tuple[str, int, int]]:
+        """Returns (call site, number of reads, bytes read) sorted by number of reads."""
+        return [(site, reads, self.call_site_bytes[site]) for site, reads in self.call_sites.most_common(count)]
+
+    def to_dict(self, top_call_sites: int = 20) -> dict:
+        return {
+            'buffers': {name: stats.to_dict() for name, stats in self.stats.items()},
+            'hottest_call_sites': [{'call_site': site, 'reads': reads, 'bytes_read': size}
+                                   for site, reads, size in self.hottest_call_sites(top_call_sites)],
+        }
+
+    def save_json(self, path: Union[str, Path], top_call_sites: int = 20):
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(top_call_sites), file, indent=2)
+
+    def to_chrome_trace(self) -> dict:
+        events = []
+        for start, duration, name, class_name, token, position, size, thread_id in self.events:
+            events.append({
+                'name': name, 'cat': class_name, 'ph': 'X', 'pid': os.getpid(), 'tid': thread_id,
+                'ts': (start - self._start_time) * 1e6, 'dur': duration * 1e6,
+                'args': {'buffer': f'{class_name}#{token}', 'offset': position, 'size': size},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ns'}
+
+    def save_chrome_trace(self, path: Union[str, Path]):
+        with open(path, 'w') as file:
+            json.dump(self.to_chrome_trace(), file)
+
+    def report(self, top_call_sites: int = 10) -> str:
+        lines = []
+        for name, stats in self.stats.items():
+            lines.append(f'{name}: {stats.reads} reads({stats.bytes_read} bytes, {stats.rereads} rereads), '
+                         f'{stats.seeks} seeks({stats.backward_seeks} backward), '
+                         f'{stats.writes} writes({stats.bytes_written} bytes)')
+        for site, reads, size in self.hottest_call_sites(top_call_sites):
+            lines.append(f'  {reads:>8} reads {size:>10} bytes  {site}')
+        return '\n'.join(lines)
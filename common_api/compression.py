@@ -0,0 +1,363 @@
+import bisect
+import contextlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Union
+
+from UniLoader.common_api.buffer_api import Buffer
+from UniLoader.common_api.textures.texture_decoder import (lz4_decompress, zstd_decompress, lz4_decompress_into,
+                                                           zstd_decompress_into, Lz4FrameDecoder, ZstdStreamDecoder,
+                                                           has_zstd_stream_support)
+
+Decompressor = Callable[[bytes, int], bytes]
+DecompressorInto = Callable[[Union[bytearray, memoryview], bytes], int]
+
+_DECOMPRESSORS: dict[str, Decompressor] = {
+    'lz4': lz4_decompress,
+    'zstd': zstd_decompress,
+}
+
+_DECOMPRESSORS_INTO: dict[str, DecompressorInto] = {
+    'lz4': lz4_decompress_into,
+    'zstd': zstd_decompress_into,
+}
+
+_STREAM_DECODERS = {
+    'lz4': Lz4FrameDecoder,
+    'zstd': ZstdStreamDecoder,
+}
+
+
+def get_decompressor(codec: Union[str, Decompressor]) -> Decompressor:
+    if callable(codec):
+        return codec
+    if codec not in _DECOMPRESSORS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {list(_DECOMPRESSORS)}")
+    return _DECOMPRESSORS[codec]
+
+
+def get_decompressor_into(codec: Union[str, DecompressorInto]) -> DecompressorInto:
+    if callable(codec):
+        return codec
+    if codec not in _DECOMPRESSORS_INTO:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {list(_DECOMPRESSORS_INTO)}")
+    return _DECOMPRESSORS_INTO[codec]
+
+
+class ScratchBufferPool:
+    """Pool of reusable scratch buffers for decompressing block after block without allocations.
+
+    Example:
+        pool = ScratchBufferPool()
+        for block in blocks:
+            with pool.borrow(block.decompressed_size) as scratch:
+                size = lz4_decompress_into(scratch, block.data)
+                parse(MemoryBuffer(scratch[:size]))
+    """
+
+    def __init__(self, max_buffers: int = 8):
+        self.max_buffers = max_buffers
+        self._free: list[bytearray] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, size: int) -> memoryview:
+        """Returns writable view of at least size bytes, view must be returned with release."""
+        with self._lock:
+            best = None
+            for index, buffer in enumerate(self._free):
+                if len(buffer) >= size and (best is None or len(buffer) < len(self._free[best])):
+                    best = index
+            if best is not None:
+                return memoryview(self._free.pop(best))[:size]
+        return memoryview(bytearray(size))
+
+    def release(self, view: memoryview):
+        buffer = view.obj
+        view.release()
+        with self._lock:
+            if len(self._free) < self.max_buffers:
+                self._free.append(buffer)
+            else:
+                smallest = min(range(len(self._free)), key=lambda i: len(self._free[i]), default=None)
+                if smallest is not None and len(self._free[smallest]) < len(buffer):
+                    self._free[smallest] = buffer
+
+    @contextlib.contextmanager
+    def borrow(self, size: int):
+        view = self.acquire(size)
+        try:
+            yield view
+        finally:
+            self.release(view)
+
+
+def decompress_many(blocks: Sequence[tuple[bytes, int]], codec: Union[str, DecompressorInto] = 'lz4',
+                    workers: Optional[int] = None, out: Optional[Union[bytearray, memoryview]] = None):
+    """Decompresses (compressed data, decompressed size) blocks in parallel into one contiguous buffer.
+
+    Native decoders release the GIL, so blocks are decompressed on thread pool. Blocks are written in input order
+    into out or newly allocated bytearray, which is returned.
+    """
+    decompress_into = get_decompressor_into(codec)
+    offsets = []
+    total_size = 0
+    for _, decompressed_size in blocks:
+        offsets.append(total_size)
+        total_size += decompressed_size
+    if out is None:
+        out = bytearray(total_size)
+    output = memoryview(out).cast('B')
+    if len(output) < total_size:
+        raise ValueError(f"Output buffer is too small: {len(output)} < {total_size}")
+
+    def decompress_block(index: int):
+        data, decompressed_size = blocks[index]
+        offset = offsets[index]
+        written = decompress_into(output[offset:offset + decompressed_size], data)
+        if written != decompressed_size:
+            raise ValueError(f"Block {index} decompressed to {written} bytes, expected {decompressed_size}")
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(blocks) < 2:
+        for index in range(len(blocks)):
+            decompress_block(index)
+    else:
+        with ThreadPoolExecutor(min(workers, len(blocks))) as executor:
+            for _ in executor.map(decompress_block, range(len(blocks))):
+                pass
+    return out
+
+
+@dataclass(slots=True)
+class CompressedChunk:
+    """Independently compressed chunk of data stored in source buffer."""
+    offset: int
+    compressed_size: int
+    decompressed_size: int
+
+
+class ChunkedCompressedBuffer(Buffer):
+    """Read-only buffer over table of independently compressed chunks.
+
+    Only chunks touched by reads are decompressed, decompressed chunks are kept in LRU cache.
+    """
+
+    def __init__(self, source: Buffer, chunks: Sequence[Union[CompressedChunk, tuple[int, int, int]]],
+                 codec: Union[str, Decompressor] = 'lz4', max_cached_chunks: int = 16):
+        super().__init__()
+        self._source = source
+        self._chunks = [chunk if isinstance(chunk, CompressedChunk) else CompressedChunk(*chunk) for chunk in chunks]
+        self._decompress = get_decompressor(codec)
+        self._chunk_starts = []
+        size = 0
+        for chunk in self._chunks:
+            self._chunk_starts.append(size)
+            size += chunk.decompressed_size
+        self._size = size
+        self._offset = 0
+        self.max_cached_chunks = max_cached_chunks
+        self._cache: OrderedDict[int, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_chunk(self, index: int) -> bytes:
+        with self._lock:
+            data = self._cache.get(index)
+            if data is not None:
+                self._cache.move_to_end(index)
+                self.hits += 1
+                return data
+            self.misses += 1
+        chunk = self._chunks[index]
+        data = self._decompress(self._source.read_at(chunk.offset, chunk.compressed_size), chunk.decompressed_size)
+        if len(data) != chunk.decompressed_size:
+            raise BufferError(f"Chunk {index} decompressed to {len(data)} bytes, expected {chunk.decompressed_size}")
+        with self._lock:
+            self._cache[index] = data
+            if len(self._cache) > self.max_cached_chunks:
+                self._cache.popitem(last=False)
+        return data
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'chunks': len(self._cache)}
+
+    @property
+    def data(self) -> bytes:
+        return self.read_at(0, self._size)
+
+    def size(self):
+        return self._size
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        if offset < 0 or offset > self._size:
+            raise BufferError(f'Offset {offset} is out of bounds(0..{self._size})')
+        size = min(size, self._size - offset)
+        if size <= 0:
+            return b''
+        index = bisect.bisect_right(self._chunk_starts, offset) - 1
+        start = offset - self._chunk_starts[index]
+        data = self._get_chunk(index)
+        if start + size <= len(data):
+            return data[start:start + size]
+        parts = []
+        while size > 0:
+            part = self._get_chunk(index)[start:start + size]
+            parts.append(part)
+            size -= len(part)
+            index += 1
+            start = 0
+        return b''.join(parts)
+
+    def read(self, _size: int = -1) -> bytes:
+        size = self._size - self._offset if _size is None or _size < 0 else _size
+        data = self.read_at(self._offset, size)
+        self._offset += len(data)
+        return data
+
+    def write(self, _b: Union[bytes, bytearray]) -> int:
+        raise io.UnsupportedOperation("ChunkedCompressedBuffer is read-only")
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._offset + offset
+        elif whence == io.SEEK_END:
+            position = self._size - offset
+        else:
+            raise ValueError("Invalid whence argument")
+
+        if position < 0 or position > self._size:
+            raise BufferError('Offset is out of bounds')
+
+        self._offset = position
+        return self._offset
+
+    def tell(self) -> int:
+        return self._offset
+
+    def slice(self, offset: Optional[int] = None, size: int = -1) -> 'Buffer':
+        return self.sub_buffer(offset, size)
+
+    def __repr__(self) -> str:
+        return f'<ChunkedCompressedBuffer {len(self._chunks)} chunks {self.tell()}/{self.size()}>'
+
+
+def decompress_stream(chunks: Iterable[bytes], codec: str = 'zstd') -> Iterator[bytes]:
+    """Decompresses stream of zstd or LZ4 frames given as iterable of compressed chunks.
+
+    Decoder is created immediately, so unknown or unsupported codec is reported here instead of on first read.
+    Empty stream decompresses to nothing.
+    """
+    if codec not in _STREAM_DECODERS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {list(_STREAM_DECODERS)}")
+    if codec == 'zstd' and not has_zstd_stream_support():
+        raise NotImplementedError("TextureDecoder library was built without zstd streaming API")
+    return _decompress_stream(chunks, _STREAM_DECODERS[codec](), codec)
+
+
+def _decompress_stream(chunks: Iterable[bytes], decoder, codec: str) -> Iterator[bytes]:
+    received = False
+    for chunk in chunks:
+        received = received or len(chunk) > 0
+        yield from decoder.feed(chunk)
+    if received and not decoder.finished:
+        raise ValueError(f"Truncated {codec} stream")
+
+
+class StreamingDecompressionBuffer(Buffer):
+    """Forward-only read-only buffer over compressed stream of unknown size, uses constant memory.
+
+    Seeking back is only possible within last history_size bytes, size is known only after stream is exhausted
+    unless provided.
+    """
+
+    def __init__(self, source: Buffer, codec: str = 'zstd', read_size: int = 128 * 1024,
+                 history_size: int = 64 * 1024, size: Optional[int] = None):
+        super().__init__()
+        self._chunks = decompress_stream(iter(lambda: source.read(read_size), b''), codec)
+        self._buffered = bytearray()
+        self._buffered_start = 0
+        self._position = 0
+        self._exhausted = False
+        self._size = size
+        self.history_size = history_size
+
+    def _fill(self, end: int):
+        """Decompresses until data up to end offset is buffered or stream is exhausted."""
+        while self._buffered_start + len(self._buffered) < end and not self._exhausted:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._exhausted = True
+                self._size = self._buffered_start + len(self._buffered)
+            else:
+                self._buffered += chunk
+
+    def _trim(self):
+        discard = self._position - self._buffered_start - self.history_size
+        if discard > self.history_size:
+            del self._buffered[:discard]
+            self._buffered_start += discard
+
+    @property
+    def data(self):
+        raise io.UnsupportedOperation("StreamingDecompressionBuffer can't provide whole data")
+
+    def size(self):
+        if self._size is None:
+            raise io.UnsupportedOperation("Stream size is unknown until stream is fully read")
+        return self._size
+
+    def __bool__(self):
+        self._fill(self._position + 1)
+        return self._position < self._buffered_start + len(self._buffered)
+
+    def read(self, _size: int = -1) -> bytes:
+        if _size is None or _size < 0:
+            chunks = []
+            while self:
+                chunks.append(self.read(self.history_size))
+            return b''.join(chunks)
+        self._fill(self._position + _size)
+        start = self._position - self._buffered_start
+        data = bytes(self._buffered[start:start + _size])
+        self._position += len(data)
+        self._trim()
+        return data
+
+    def write(self, _b: Union[bytes, bytearray]) -> int:
+        raise io.UnsupportedOperation("StreamingDecompressionBuffer is read-only")
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            self.read()
+            position = self.size() - offset
+        else:
+            raise ValueError("Invalid whence argument")
+        if position < self._buffered_start:
+            raise io.UnsupportedOperation(f"Can't seek back to {position}, stream is forward-only")
+        while self._position < position:
+            self._fill(min(position, self._position + self.history_size))
+            available = self._buffered_start + len(self._buffered)
+            if available <= self._position:
+                raise BufferError('Offset is out of bounds')
+            self._position = min(position, available)
+            self._trim()
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def __repr__(self) -> str:
+        return f'<StreamingDecompressionBuffer {self.tell()}>'
@@ -0,0 +1,136 @@
+from dataclasses import dataclass, field
+from enum import Enum
+
+import numpy as np
+
+
+class PrimitiveTopology(Enum):
+    """Represents the way indices form triangles."""
+    TriangleList = "TRIANGLE_LIST"
+    TriangleStrip = "TRIANGLE_STRIP"
+    TriangleFan = "TRIANGLE_FAN"
+
+
+def _segment_starts(restart_mask: np.ndarray) -> np.ndarray:
+    """Returns index of first element of primitive each element belongs to."""
+    positions = np.arange(1, len(restart_mask) + 1)
+    return np.maximum.accumulate(np.where(restart_mask, positions, 0))
+
+
+def _restart_mask(indices: np.ndarray, restart_index: int | None) -> np.ndarray | None:
+    if restart_index is None:
+        return None
+    mask = indices == restart_index
+    return mask if mask.any() else None
+
+
+def strip_to_list(indices: np.ndarray, restart_index: int | None = None) -> np.ndarray:
+    """Converts triangle strip(s) into (N, 3) triangle list, every odd triangle of strip gets its winding flipped.
+
+    Strips are separated by restart_index when provided.
+    """
+    if len(indices) < 3:
+        return np.empty((0, 3), indices.dtype)
+    triangle_ends = np.arange(2, len(indices))
+    restart_mask = _restart_mask(indices, restart_index)
+    if restart_mask is None:
+        odd = (triangle_ends & 1).astype(bool)
+        valid = None
+    else:
+        odd = ((triangle_ends - _segment_starts(restart_mask)[2:]) & 1).astype(bool)
+        valid = ~(restart_mask[:-2] | restart_mask[1:-1] | restart_mask[2:])
+    faces = np.empty((len(triangle_ends), 3), indices.dtype)
+    faces[:, 0] = np.where(odd, indices[1:-1], indices[:-2])
+    faces[:, 1] = np.where(odd, indices[:-2], indices[1:-1])
+    faces[:, 2] = indices[2:]
+    return faces if valid is None else faces[valid]
+
+
+def fan_to_list(indices: np.ndarray, restart_index: int | None = None) -> np.ndarray:
+    """Converts triangle fan(s) into (N, 3) triangle list. Fans are separated by restart_index when provided."""
+    if len(indices) < 3:
+        return np.empty((0, 3), indices.dtype)
+    restart_mask = _restart_mask(indices, restart_index)
+    if restart_mask is None:
+        faces = np.empty((len(indices) - 2, 3), indices.dtype)
+        faces[:, 0] = indices[0]
+        faces[:, 1] = indices[1:-1]
+        faces[:, 2] = indices[2:]
+        return faces
+    segment_starts = _segment_starts(restart_mask)
+    triangle_ends = np.arange(2, len(indices))
+    valid = ((triangle_ends - segment_starts[2:] >= 2) &
+             ~(restart_mask[:-2] | restart_mask[1:-1] | restart_mask[2:]))
+    triangle_ends = triangle_ends[valid]
+    faces = np.empty((len(triangle_ends), 3), indices.dtype)
+    faces[:, 0] = indices[segment_starts[triangle_ends]]
+    faces[:, 1] = indices[triangle_ends - 1]
+    faces[:, 2] = indices[triangle_ends]
+    return faces
+
+
+def list_to_faces(indices: np.ndarray, restart_index: int | None = None) -> np.ndarray:
+    """Reshapes triangle list into (N, 3) array, restart indices are dropped if present."""
+    restart_mask = _restart_mask(indices, restart_index)
+    if restart_mask is not None:
+        indices = indices[~restart_mask]
+    if len(indices) % 3:
+        raise ValueError(f"Triangle list index count {len(indices)} is not a multiple of 3")
+    return indices.reshape(-1, 3)
+
+
+def remove_degenerate_faces(faces: np.ndarray) -> np.ndarray:
+    """Removes triangles that reference same vertex more than once."""
+    a, b, c = faces[:, 0], faces[:, 1], faces[:, 2]
+    return faces[(a != b) & (b != c) & (a != c)]
+
+
+_TOPOLOGY_CONVERTERS = {
+    PrimitiveTopology.TriangleList: list_to_faces,
+    PrimitiveTopology.TriangleStrip: strip_to_list,
+    PrimitiveTopology.TriangleFan: fan_to_list,
+}
+
+
+@dataclass
+class IndexBuffer:
+    """Represents an index buffer."""
+    topology: PrimitiveTopology = field(default=PrimitiveTopology.TriangleList)
+    index_size: int = field(default=2)  # Size of single index in bytes: 1, 2 or 4
+    big_endian: bool = field(default=False)
+    base_vertex: int = field(default=0)  # Added to every index
+    restart_index: int | None = field(default=None)  # Primitive restart value, usually 0xFFFF or 0xFFFFFFFF
+    flip_winding: bool = field(default=False)  # Reverses winding of all faces
+    data: bytes | None = field(default=None)  # Optional storage, used if no argument for read_indices provided
+
+    def __post_init__(self):
+        if self.index_size not in (1, 2, 4):
+            raise ValueError(f"Unsupported index size {self.index_size}, expected 1, 2 or 4")
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Returns the data type of single index."""
+        return np.dtype(f'{">" if self.big_endian else "<"}u{self.index_size}')
+
+    def read_indices(self, count: int, data: bytes | None = None) -> np.ndarray:
+        """Returns zero-copy view of count raw indices, base vertex is not applied."""
+        if data is None:
+            data = self.data
+        if data is None:
+            raise ValueError("No data provided to read from: argument data is None and self.data is None")
+        if count * self.index_size > memoryview(data).nbytes:
+            raise ValueError(f"Data length {memoryview(data).nbytes} is too small for {count} indices")
+        return np.frombuffer(data, self.dtype, count)
+
+    def read_faces(self, count: int, data: bytes | None = None, remove_degenerate: bool = True) -> np.ndarray:
+        """Reads count indices and converts them into (N, 3) int32 triangle list."""
+        indices = self.read_indices(count, data)
+        faces = _TOPOLOGY_CONVERTERS[self.topology](indices, self.restart_index)
+        if remove_degenerate:
+            faces = remove_degenerate_faces(faces)
+        faces = faces.astype(np.int32)
+        if self.base_vertex:
+            faces += np.int32(self.base_vertex)
+        if self.flip_winding:
+            faces = faces[:, ::-1]
+        return faces
@@ -1,9 +1,13 @@
+import re
 from typing import Optional
 
 import bpy
 import numpy as np
 
-from UniLoader.bpy_helper import is_blender_4_1
+from UniLoader.bpy_helper import is_blender_4, is_blender_4_1
+from UniLoader.common_api.vertex_buffer import VertexLayout
+
+_SEMANTIC_ID = re.compile(r'^(.*?)(\d*)$')
 
 
 def add_uv_layer(name: str, uv_data: np.ndarray, mesh_data: bpy.types.Mesh,
@@ -44,9 +48,117 @@ def add_custom_normals_from_faces(normals: np.ndarray, mesh_data: bpy.types.Mesh
     mesh_data.normals_split_custom_set(normals)
 
 
-def add_weights(bone_indices: np.ndarray, bone_weights: np.ndarray, bone_names: list[str], mesh_obj: bpy.types.Object):
-    weight_groups = {name: mesh_obj.vertex_groups.new(name=name) for name in bone_names}
-    for n, (index_group, weight_group), in enumerate(zip(bone_indices, bone_weights)):
-        for index, weight in zip(index_group,weight_group):
-            if weight > 0:
-                weight_groups[bone_names[index]].add([n], weight, 'REPLACE')
+def add_weights(bone_indices: np.ndarray, bone_weights: np.ndarray, bone_names: list[str], mesh_obj: bpy.types.Object,
+                bone_remap: Optional[np.ndarray] = None, normalize: bool = False):
+    """Adds (vertex count, influences) bone indices and weights as vertex groups, any number of influences is supported.
+
+    bone_remap maps bone indices stored in vertices to indices in bone_names. Zero weights are dropped and weights of
+    same bone on same vertex are summed. Vertices are grouped by (bone, weight), so vertex_groups add is called once
+    per distinct weight of each bone instead of once per influence.
+    """
+    weight_groups = [mesh_obj.vertex_groups.new(name=name) for name in bone_names]
+    vertex_count = len(bone_indices)
+    bone_indices = np.asarray(bone_indices).reshape(vertex_count, -1).astype(np.int64)
+    bone_weights = np.asarray(bone_weights, np.float32).reshape(vertex_count, -1)
+    if normalize:
+        totals = np.where(bone_weights > 0, bone_weights, 0).sum(axis=1, keepdims=True)
+        bone_weights = np.divide(bone_weights, totals, out=np.zeros_like(bone_weights), where=totals > 0)
+
+    mask = bone_weights > 0
+    vertices = np.broadcast_to(np.arange(vertex_count)[:, None], mask.shape)[mask]
+    bones = bone_indices[mask]
+    weights = bone_weights[mask]
+    if bone_remap is not None:
+        # Remapped after masking, unused influences may hold sentinel indices outside of remap table
+        bone_remap = np.asarray(bone_remap, np.int64)
+        if len(bones) and (bones.min() < 0 or bones.max() >= len(bone_remap)):
+            raise ValueError(f"Bone index out of range of {len(bone_remap)} remap entries")
+        bones = bone_remap[bones]
+    if len(bones) and (bones.min() < 0 or bones.max() >= len(bone_names)):
+        raise ValueError(f"Bone index out of range of {len(bone_names)} bone names")
+
+    pairs, inverse = np.unique(vertices * len(bone_names) + bones, return_inverse=True)
+    weights = np.bincount(inverse.ravel(), weights, len(pairs)).astype(np.float32)
+    vertices, bones = np.divmod(pairs, len(bone_names))
+
+    order = np.lexsort((vertices, weights, bones))
+    vertices, bones, weights = vertices[order], bones[order], weights[order]
+    starts = np.flatnonzero(np.diff(bones, prepend=-1) | (np.diff(weights, prepend=-1) != 0))
+    ends = np.append(starts[1:], len(vertices))
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        weight_groups[bones[start]].add(vertices[start:end].tolist(), float(weights[start]), 'REPLACE')
+
+
+def _vertex_semantics(vertices: np.ndarray, layout: Optional[VertexLayout]) -> dict[str, list[tuple[int, str]]]:
+    """Groups vertex fields by semantic name, returns {name: [(index, field name), ...]} sorted by index."""
+    semantics: dict[str, list[tuple[int, str]]] = {}
+    if layout is not None:
+        for attribute in layout.attributes:
+            semantics.setdefault(attribute.semantic_name, []).append((attribute.semantic_index, attribute.semantic_id))
+    else:
+        for field_name in vertices.dtype.names:
+            name, index = _SEMANTIC_ID.match(field_name).groups()
+            semantics.setdefault(name, []).append((int(index) if index else -1, field_name))
+    for fields in semantics.values():
+        fields.sort()
+    return semantics
+
+
+def _as_float_rows(values: np.ndarray, components: Optional[int] = None) -> np.ndarray:
+    """Returns first components of each value as floats, normalized integers are mapped to [0, 1] range."""
+    if values.ndim == 1:
+        values = values[:, None]
+    if values.dtype.kind in 'ui':
+        return values[:, :components].astype(np.float32) / np.float32(np.iinfo(values.dtype).max)
+    return values[:, :components].astype(np.float32, copy=False)
+
+
+def build_mesh(name: str, vertices: np.ndarray, indices: np.ndarray, layout: Optional[VertexLayout] = None,
+               flip_uv: bool = True) -> bpy.types.Mesh:
+    """Creates mesh from structured vertex array(VertexBuffer.read_vertices output) and triangle indices.
+
+    Vertices, loops and polygons are allocated in bulk and filled with foreach_set. POSITION, NORMAL, UV and COLOR
+    fields are found by semantic from layout or, when layout is not provided, from vertex field names.
+    Use add_weights_from_vertices on object of this mesh to add weights.
+    """
+    faces = np.ascontiguousarray(indices, dtype=np.int32).reshape(-1, 3)
+    semantics = _vertex_semantics(vertices, layout)
+    if 'POSITION' not in semantics:
+        raise ValueError("Vertices have no POSITION field")
+
+    mesh_data = bpy.data.meshes.new(name)
+    mesh_data.vertices.add(len(vertices))
+    positions = _as_float_rows(vertices[semantics['POSITION'][0][1]], 3)
+    mesh_data.vertices.foreach_set('co', np.ascontiguousarray(positions).ravel())
+
+    vertex_indices = faces.ravel()
+    mesh_data.loops.add(len(vertex_indices))
+    mesh_data.loops.foreach_set('vertex_index', vertex_indices)
+    mesh_data.polygons.add(len(faces))
+    mesh_data.polygons.foreach_set('loop_start', np.arange(0, len(vertex_indices), 3, dtype=np.int32))
+    if not is_blender_4():
+        mesh_data.polygons.foreach_set('loop_total', np.full(len(faces), 3, np.int32))
+    mesh_data.update(calc_edges=True)
+
+    for index, field_name in semantics.get('UV', []):
+        add_uv_layer(field_name, _as_float_rows(vertices[field_name], 2), mesh_data, vertex_indices, flip_uv)
+    for index, field_name in semantics.get('COLOR', []):
+        colors = _as_float_rows(vertices[field_name], 4)
+        if colors.shape[1] < 4:
+            colors = np.pad(colors, ((0, 0), (0, 4 - colors.shape[1])), constant_values=1)
+        add_vertex_color_layer(field_name, colors, mesh_data, vertex_indices)
+    if 'NORMAL' in semantics:
+        normals = _as_float_rows(vertices[semantics['NORMAL'][0][1]], 3)
+        add_custom_normals(normals, mesh_data)
+    return mesh_data
+
+
+def add_weights_from_vertices(vertices: np.ndarray, bone_names: list[str], mesh_obj: bpy.types.Object,
+                              layout: Optional[VertexLayout] = None):
+    """Adds weights from all BONE_INDICES/BONE_WEIGHT fields of structured vertex array."""
+    semantics = _vertex_semantics(vertices, layout)
+    if 'BONE_INDICES' not in semantics or 'BONE_WEIGHT' not in semantics:
+        raise ValueError("Vertices have no BONE_INDICES/BONE_WEIGHT fields")
+    bone_indices = [vertices[field_name].reshape(len(vertices), -1) for _, field_name in semantics['BONE_INDICES']]
+    bone_weights = [_as_float_rows(vertices[field_name]) for _, field_name in semantics['BONE_WEIGHT']]
+    add_weights(np.concatenate(bone_indices, axis=1), np.concatenate(bone_weights, axis=1), bone_names, mesh_obj)
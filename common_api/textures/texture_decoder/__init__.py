@@ -1,9 +1,12 @@
 import ctypes
 import platform
+import struct
 from ctypes import cdll
 from enum import IntEnum, auto
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Union
+
+import numpy as np
 
 _platform_info = platform.uname()
 _lib_path: Optional[Path] = Path(__file__).parent
@@ -167,14 +170,56 @@ _lib.get_uncompressed_pixel_format_variant.argtypes = [ctypes.c_uint32]
 _lib.get_uncompressed_pixel_format_variant.restype = ctypes.c_uint32
 
 # DLL_EXPORT size_t zstd_decompress( void* dst, size_t dstCapacity, const void* src, size_t compressedSize);
-_lib.zstd_decompress.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t]
+_lib.zstd_decompress.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p, ctypes.c_size_t]
 _lib.zstd_decompress.restype = ctypes.c_size_t
 
 # DLL_EXPORT size_t lz4_decompress( void* dst, size_t dstCapacity, const void* src, size_t compressedSize);
-_lib.lz4_decompress.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t]
+_lib.lz4_decompress.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p, ctypes.c_size_t]
 _lib.lz4_decompress.restype = ctypes.c_size_t
 
 
+# Streaming API is not exported by every build of the library, these are bound only when present.
+class _ZstdInBuffer(ctypes.Structure):
+    _fields_ = [("src", ctypes.c_void_p), ("size", ctypes.c_size_t), ("pos", ctypes.c_size_t)]
+
+
+class _ZstdOutBuffer(ctypes.Structure):
+    _fields_ = [("dst", ctypes.c_void_p), ("size", ctypes.c_size_t), ("pos", ctypes.c_size_t)]
+
+
+def _bind_optional(name: str, argtypes: list, restype) -> bool:
+    function = getattr(_lib, name, None)
+    if function is None:
+        return False
+    function.argtypes = argtypes
+    function.restype = restype
+    return True
+
+
+_has_zstd_stream = all([
+    # ZSTD_DStream *ZSTD_createDStream(void);
+    _bind_optional("ZSTD_createDStream", [], ctypes.c_void_p),
+    # size_t ZSTD_freeDStream(ZSTD_DStream *zds);
+    _bind_optional("ZSTD_freeDStream", [ctypes.c_void_p], ctypes.c_size_t),
+    # size_t ZSTD_initDStream(ZSTD_DStream *zds);
+    _bind_optional("ZSTD_initDStream", [ctypes.c_void_p], ctypes.c_size_t),
+    # size_t ZSTD_decompressStream(ZSTD_DStream *zds, ZSTD_outBuffer *output, ZSTD_inBuffer *input);
+    _bind_optional("ZSTD_decompressStream",
+                   [ctypes.c_void_p, ctypes.POINTER(_ZstdOutBuffer), ctypes.POINTER(_ZstdInBuffer)], ctypes.c_size_t),
+    # size_t ZSTD_DStreamOutSize(void);
+    _bind_optional("ZSTD_DStreamOutSize", [], ctypes.c_size_t),
+    # unsigned ZSTD_isError(size_t code);
+    _bind_optional("ZSTD_isError", [ctypes.c_size_t], ctypes.c_uint),
+    # const char *ZSTD_getErrorName(size_t code);
+    _bind_optional("ZSTD_getErrorName", [ctypes.c_size_t], ctypes.c_char_p),
+])
+
+# int LZ4_decompress_safe_usingDict(const char *src, char *dst, int srcSize, int dstCapacity, const char *dictStart, int dictSize);
+_has_lz4_dict = _bind_optional("LZ4_decompress_safe_usingDict",
+                               [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_void_p,
+                                ctypes.c_int], ctypes.c_int)
+
+
 class Texture:
     def __init__(self, p):
         self.ptr = p
@@ -289,13 +334,215 @@ def get_buffer_size_from_texture_format(width: int, height: int, pixel_format: P
     return _lib.get_buffer_size_from_texture_format(width, height, pixel_format)
 
 
+BytesLike = Union[bytes, bytearray, memoryview, np.ndarray]
+
+
+def _buffer_array(buffer: BytesLike, writable: bool = False) -> np.ndarray:
+    """Byte view of buffer, used to pass any contiguous buffer to native code without copying."""
+    array = np.frombuffer(buffer, np.uint8)
+    if writable and not array.flags.writeable:
+        raise ValueError("Destination buffer is read-only")
+    return array
+
+
+def _decompress_into(function, name: str, dst: BytesLike, src: BytesLike) -> int:
+    dst_array = _buffer_array(dst, True)
+    src_array = _buffer_array(src)
+    written = function(dst_array.ctypes.data, dst_array.nbytes, src_array.ctypes.data, src_array.nbytes)
+    if written > dst_array.nbytes:
+        raise ValueError(f"{name} decompression failed")
+    return written
+
+
+def lz4_decompress_into(dst: BytesLike, src: BytesLike) -> int:
+    """Decompresses lz4 block into caller provided writable buffer, returns number of bytes written."""
+    return _decompress_into(_lib.lz4_decompress, "LZ4", dst, src)
+
+
+def zstd_decompress_into(dst: BytesLike, src: BytesLike) -> int:
+    """Decompresses zstd frame into caller provided writable buffer, returns number of bytes written."""
+    return _decompress_into(_lib.zstd_decompress, "ZSTD", dst, src)
+
+
 def lz4_decompress(data: bytes, decompressed_size: int):
     decompressed = bytes(decompressed_size)
     decompressed_size = _lib.lz4_decompress(decompressed, decompressed_size, data, len(data))
+    if decompressed_size == len(decompressed):
+        return decompressed
     return decompressed[:decompressed_size]
 
 
 def zstd_decompress(data: bytes, decompressed_size: int):
     decompressed = bytes(decompressed_size)
     decompressed_size = _lib.zstd_decompress(decompressed, decompressed_size, data, len(data))
+    if decompressed_size == len(decompressed):
+        return decompressed
     return decompressed[:decompressed_size]
+
+
+def has_zstd_stream_support() -> bool:
+    return _has_zstd_stream
+
+
+class ZstdStreamDecoder:
+    """Streaming zstd decoder for frames of unknown size. Feed compressed chunks, get decompressed chunks back."""
+
+    def __init__(self):
+        if not _has_zstd_stream:
+            raise NotImplementedError("TextureDecoder library was built without zstd streaming API")
+        self._stream = _lib.ZSTD_createDStream()
+        if not self._stream:
+            raise MemoryError("Failed to create zstd stream")
+        self._check(_lib.ZSTD_initDStream(self._stream))
+        self._output = bytearray(_lib.ZSTD_DStreamOutSize())
+        self._output_array = _buffer_array(self._output, True)
+        self.finished = False
+
+    def __del__(self):
+        if getattr(self, '_stream', None):
+            _lib.ZSTD_freeDStream(self._stream)
+            self._stream = None
+
+    @staticmethod
+    def _check(code: int) -> int:
+        if _lib.ZSTD_isError(code):
+            raise ValueError(f"ZSTD stream decompression failed: {_lib.ZSTD_getErrorName(code).decode('ascii')}")
+        return code
+
+    def feed(self, data: BytesLike) -> Iterator[bytes]:
+        source = _buffer_array(data)
+        input_buffer = _ZstdInBuffer(source.ctypes.data, source.nbytes, 0)
+        output_buffer = _ZstdOutBuffer(self._output_array.ctypes.data, self._output_array.nbytes, 0)
+        while True:
+            output_buffer.pos = 0
+            result = self._check(_lib.ZSTD_decompressStream(self._stream, output_buffer, input_buffer))
+            if result == 0:
+                self.finished = True
+            elif input_buffer.pos:
+                self.finished = False
+            if output_buffer.pos:
+                yield bytes(self._output[:output_buffer.pos])
+            if input_buffer.pos == input_buffer.size and output_buffer.pos < output_buffer.size:
+                return
+
+
+class Lz4FrameDecoder:
+    """Streaming decoder of LZ4 frame format. Feed compressed chunks, get decompressed chunks back.
+
+    Blocks are decoded with native lz4 block decoder, linked blocks require LZ4_decompress_safe_usingDict export.
+    Checksums are not verified.
+    """
+    _MAGIC = 0x184D2204
+    _BLOCK_SIZES = {4: 64 * 1024, 5: 256 * 1024, 6: 1024 * 1024, 7: 4 * 1024 * 1024}
+    _HISTORY_SIZE = 64 * 1024
+
+    def __init__(self):
+        self._input = bytearray()
+        self._state = 'magic'
+        self._skip = 0
+        self._block_checksum = False
+        self._content_checksum = False
+        self._linked = False
+        self._max_block_size = 0
+        self._history = b''
+        self.finished = False
+
+    def feed(self, data: BytesLike) -> Iterator[bytes]:
+        self._input += data
+        while True:
+            output = self._step()
+            if output is None:
+                return
+            if output:
+                yield output
+
+    def _consume(self, size: int) -> Optional[bytes]:
+        if len(self._input) < size:
+            return None
+        data = bytes(self._input[:size])
+        del self._input[:size]
+        return data
+
+    def _step(self) -> Optional[bytes]:
+        """Advances state machine, returns None when more input is required."""
+        if self._state == 'magic':
+            if len(self._input) < 4:
+                return None
+            magic, = struct.unpack_from('<I', self._input)
+            if 0x184D2A50 <= magic <= 0x184D2A5F:
+                if len(self._input) < 8:
+                    return None
+                self._skip = struct.unpack('<4xI', self._consume(8))[0]
+                self._state = 'skip'
+            elif magic == self._MAGIC:
+                self._state = 'header'
+                self.finished = False
+            else:
+                raise ValueError(f"Invalid LZ4 frame magic {magic:#x}")
+            return b''
+        if self._state == 'skip':
+            skipped = min(self._skip, len(self._input))
+            del self._input[:skipped]
+            self._skip -= skipped
+            if self._skip:
+                return None
+            self._state = 'magic'
+            return b''
+        if self._state == 'header':
+            if len(self._input) < 6:
+                return None
+            flags, block_descriptor = self._input[4], self._input[5]
+            if flags >> 6 != 1:
+                raise ValueError(f"Unsupported LZ4 frame version {flags >> 6}")
+            header_size = 4 + 2 + (8 if flags & 0x08 else 0) + (4 if flags & 0x01 else 0) + 1
+            if self._consume(header_size) is None:
+                return None
+            self._linked = not flags & 0x20
+            self._block_checksum = bool(flags & 0x10)
+            self._content_checksum = bool(flags & 0x04)
+            self._max_block_size = self._BLOCK_SIZES[(block_descriptor >> 4) & 0x7]
+            if self._linked and not _has_lz4_dict:
+                raise NotImplementedError("TextureDecoder library was built without LZ4_decompress_safe_usingDict, "
+                                          "linked LZ4 blocks are not supported")
+            self._history = b''
+            self._state = 'block'
+            return b''
+        if self._state == 'block':
+            if len(self._input) < 4:
+                return None
+            block_size, = struct.unpack_from('<I', self._input)
+            if block_size == 0:
+                del self._input[:4]
+                self._state = 'content_checksum' if self._content_checksum else 'magic'
+                self.finished = not self._content_checksum
+                return b''
+            data_size = block_size & 0x7FFFFFFF
+            block = self._consume(4 + data_size + (4 if self._block_checksum else 0))
+            if block is None:
+                return None
+            block = block[4:4 + data_size]
+            if block_size & 0x80000000:
+                output = block
+            else:
+                output = self._decompress_block(block)
+            if self._linked:
+                self._history = (self._history + output)[-self._HISTORY_SIZE:]
+            return output
+        if self._state == 'content_checksum':
+            if self._consume(4) is None:
+                return None
+            self._state = 'magic'
+            self.finished = True
+            return b''
+        raise AssertionError(f"Invalid state {self._state}")
+
+    def _decompress_block(self, block: bytes) -> bytes:
+        output = bytearray(self._max_block_size)
+        if not self._linked or not self._history:
+            return bytes(output[:lz4_decompress_into(output, block)])
+        output_array = _buffer_array(output, True)
+        written = _lib.LZ4_decompress_safe_usingDict(block, output_array.ctypes.data, len(block), len(output),
+                                                     self._history, len(self._history))
+        if written < 0:
+            raise ValueError("LZ4 decompression failed")
+        return bytes(output[:written])
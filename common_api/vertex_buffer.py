@@ -1,10 +1,13 @@
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-from functools import cached_property
-from typing import Callable
+from typing import Callable, Iterator, Sequence
 
 import numpy as np
 
+from UniLoader.common_api.buffer_api import Buffer
+
 
 class VertexAttributeType(Enum):
     """Represents the type of vertex attribute."""
@@ -15,6 +18,134 @@ class VertexAttributeType(Enum):
     UByte4 = (np.uint8, (4,))
     Matrix4x4 = (np.float32, (4, 4))
     Custom = (np.void, (0,))
+    # Stored types of quantized attributes, use with converter
+    UByte2 = (np.uint8, (2,))
+    Byte2 = (np.int8, (2,))
+    Byte4 = (np.int8, (4,))
+    UShort2 = (np.uint16, (2,))
+    UShort4 = (np.uint16, (4,))
+    Short2 = (np.int16, (2,))
+    Short4 = (np.int16, (4,))
+    Half2 = (np.float16, (2,))
+    Half4 = (np.float16, (4,))
+    UInt = (np.uint32, (1,))
+    UInt3 = (np.uint32, (3,))
+
+
+def snorm_to_float(values: np.ndarray) -> np.ndarray:
+    """Converts signed normalized integers(SNORM8/SNORM16) to floats in [-1, 1] range."""
+    max_value = np.iinfo(values.dtype).max
+    return np.maximum(values.astype(np.float32) * np.float32(1 / max_value), np.float32(-1))
+
+
+def unorm_to_float(values: np.ndarray) -> np.ndarray:
+    """Converts unsigned normalized integers(UNORM8/UNORM16) to floats in [0, 1] range."""
+    return values.astype(np.float32) * np.float32(1 / np.iinfo(values.dtype).max)
+
+
+def half_to_float(values: np.ndarray) -> np.ndarray:
+    return values.astype(np.float32)
+
+
+def _packed_uint32(values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind == 'V':
+        values = values.view('<u4')
+    return values.reshape(-1)
+
+
+def unorm_10_10_10_2_to_float(values: np.ndarray) -> np.ndarray:
+    """Unpacks R10G10B10A2 UNORM values into (N, 4) floats in [0, 1] range."""
+    values = _packed_uint32(values)
+    output = np.empty((len(values), 4), np.float32)
+    output[:, 0] = values & 0x3FF
+    output[:, 1] = (values >> 10) & 0x3FF
+    output[:, 2] = (values >> 20) & 0x3FF
+    output[:, 3] = values >> 30
+    output *= np.array([1 / 1023, 1 / 1023, 1 / 1023, 1 / 3], np.float32)
+    return output
+
+
+def snorm_10_10_10_2_to_float(values: np.ndarray) -> np.ndarray:
+    """Unpacks R10G10B10A2 SNORM values into (N, 4) floats in [-1, 1] range."""
+    values = _packed_uint32(values).astype(np.int32)
+    output = np.empty((len(values), 4), np.float32)
+    for component in range(3):
+        output[:, component] = (((values >> (component * 10)) & 0x3FF) ^ 0x200) - 0x200
+    output[:, 3] = (((values >> 30) & 0x3) ^ 0x2) - 0x2
+    output *= np.array([1 / 511, 1 / 511, 1 / 511, 1], np.float32)
+    return np.maximum(output, np.float32(-1), out=output)
+
+
+def octahedral_to_vector3(values: np.ndarray) -> np.ndarray:
+    """Decodes octahedral encoded unit vectors(normals, tangents) into (N, 3) floats.
+
+    Values are (N, 2) floats in [-1, 1] range, SNORM integers or UNORM integers mapped to [-1, 1].
+    """
+    if values.dtype.kind == 'i':
+        values = snorm_to_float(values)
+    elif values.dtype.kind == 'u':
+        values = unorm_to_float(values) * np.float32(2) - np.float32(1)
+    output = np.empty((len(values), 3), np.float32)
+    x = output[:, 0]
+    y = output[:, 1]
+    z = output[:, 2]
+    x[:] = values[:, 0]
+    y[:] = values[:, 1]
+    np.subtract(1, np.abs(x) + np.abs(y), out=z)
+    fold = np.maximum(-z, 0)
+    x -= np.copysign(fold, x)
+    y -= np.copysign(fold, y)
+    output /= np.linalg.norm(output, axis=1, keepdims=True)
+    return output
+
+
+def dequantize(scale, bias, normalized: bool = False) -> Callable[[np.ndarray], np.ndarray]:
+    """Returns converter computing values * scale + bias, values are first normalized by SNORM/UNORM rules
+    when normalized is set. Scale and bias are scalars or per-component arrays."""
+    scale = np.asarray(scale, np.float32)
+    bias = np.asarray(bias, np.float32)
+
+    def converter(values: np.ndarray) -> np.ndarray:
+        if normalized:
+            values = snorm_to_float(values) if values.dtype.kind == 'i' else unorm_to_float(values)
+        output = values.astype(np.float32, copy=not normalized)
+        output *= scale
+        output += bias
+        return output
+
+    return converter
+
+
+def dequantize_submeshes(values: np.ndarray, vertex_counts, scales, biases, normalized: bool = False) -> np.ndarray:
+    """Dequantizes vertices of several submeshes at once, each submesh has its own scale and bias.
+
+    values: quantized values of all submeshes, submeshes follow each other in vertex_counts order.
+    scales, biases: (submesh count,) or (submesh count, components) arrays.
+    """
+    if normalized:
+        values = snorm_to_float(values) if values.dtype.kind == 'i' else unorm_to_float(values)
+    vertex_counts = np.asarray(vertex_counts)
+    if vertex_counts.sum() != len(values):
+        raise ValueError(f"Submesh vertex counts sum to {vertex_counts.sum()}, expected {len(values)}")
+    output = values.astype(np.float32, copy=not normalized)
+    output *= _per_vertex(scales, vertex_counts, output.ndim)
+    output += _per_vertex(biases, vertex_counts, output.ndim)
+    return output
+
+
+def _per_vertex(parameters, vertex_counts: np.ndarray, ndim: int) -> np.ndarray:
+    parameters = np.repeat(np.asarray(parameters, np.float32), vertex_counts, axis=0)
+    return parameters.reshape(parameters.shape + (1,) * (ndim - parameters.ndim))
+
+
+VERTEX_CONVERTERS: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'snorm': snorm_to_float,
+    'unorm': unorm_to_float,
+    'half': half_to_float,
+    'unorm_10_10_10_2': unorm_10_10_10_2_to_float,
+    'snorm_10_10_10_2': snorm_10_10_10_2_to_float,
+    'octahedral': octahedral_to_vector3,
+}
 
 
 # noinspection PyPep8Naming
@@ -112,19 +243,50 @@ class VertexAttributeSemantic(metaclass=_MetaVertexAttributeSemantic):
         return self.id()
 
 
+def _inner_dtype(inner_type: VertexAttributeType, size: int | None) -> np.dtype:
+    if inner_type == VertexAttributeType.Custom:
+        return np.dtype(f'V{size}')
+    return np.dtype(inner_type.value)
+
+
+@dataclass(frozen=True, slots=True)
+class VertexAttributeDescriptor:
+    """Data-free hashable description of vertex attribute, used by VertexLayout."""
+    semantic_name: str
+    semantic_index: int
+    type: VertexAttributeType
+    inner_type: VertexAttributeType
+    size: int | None
+
+    @property
+    def semantic_id(self) -> str:
+        return self.semantic_name if self.semantic_index < 0 else f"{self.semantic_name}{self.semantic_index}"
+
+    @property
+    def inner_dtype(self) -> np.dtype:
+        return _inner_dtype(self.inner_type, self.size)
+
+
 @dataclass(slots=True)
 class VertexAttribute:
     """Represents a vertex attribute in a vertex buffer."""
     semantic: VertexAttributeSemantic
     type: VertexAttributeType
     inner_type: VertexAttributeType | None = field(default=None)  # Optional, defaults to same value as type
-    converter: Callable[[np.ndarray], np.ndarray] | None = field(default=None)  # Must be present for Custom inner type
+    # Must be present for Custom inner type, name of VERTEX_CONVERTERS entry or callable
+    converter: Callable[[np.ndarray], np.ndarray] | str | None = field(default=None)
     size: int | None = field(default=None)  # Must be present for Custom inner type or when type!=inner_type
     data: np.ndarray = field(default=None)  # Used only for non-interleaved vertex data
+    offset: int = field(default=0)  # Offset of first element in data, used only for non-interleaved vertex data
+    stride: int | None = field(default=None)  # Optional, defaults to size of inner type, used only for non-interleaved
 
     def __post_init__(self):
         if self.inner_type is None:
             self.inner_type = self.type
+        if isinstance(self.converter, str):
+            if self.converter not in VERTEX_CONVERTERS:
+                raise ValueError(f"Unknown converter {self.converter!r}, expected one of {list(VERTEX_CONVERTERS)}")
+            self.converter = VERTEX_CONVERTERS[self.converter]
 
         if self.inner_type == VertexAttributeType.Custom:
             if self.converter is None or self.size is None:
@@ -132,6 +294,121 @@ class VertexAttribute:
         elif self.type != self.inner_type and self.converter is None:
             raise ValueError("Converter must be None when type != inner_type")
 
+    @property
+    def inner_dtype(self) -> np.dtype:
+        """Returns the data type of single stored element of the attribute."""
+        return _inner_dtype(self.inner_type, self.size)
+
+    def descriptor(self) -> VertexAttributeDescriptor:
+        return VertexAttributeDescriptor(self.semantic.name, self.semantic.index, self.type, self.inner_type, self.size)
+
+    def view(self, data, count: int, offset: int = 0, stride: int | None = None) -> np.ndarray:
+        """Returns zero-copy view of count stored elements of the attribute in data."""
+        inner_dtype = self.inner_dtype
+        stride = stride or inner_dtype.itemsize
+        data = memoryview(data).cast('B')
+        if count and offset + (count - 1) * stride + inner_dtype.itemsize > len(data):
+            raise ValueError(f"Data of attribute {self.semantic} is too small for {count} elements")
+        return np.ndarray((count,), inner_dtype, data, offset, (stride,))
+
+    def convert(self, stored: np.ndarray) -> np.ndarray:
+        """Converts stored elements into attribute type, returns stored elements as is if there is no converter."""
+        if self.converter is None:
+            if self.type != self.inner_type:
+                raise ValueError(f"Converter required for attribute {self.semantic}")
+            return stored
+        return self.converter(stored)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class VertexLayout:
+    """Compiled interleaved vertex layout with precomputed dtypes, offsets, stride and padding.
+
+    Layouts are immutable and shared, use VertexLayout.get to get registered layout for list of attributes.
+    Layout only describes storage, converters and non-interleaved data stay on VertexBuffer attributes.
+    """
+    attributes: tuple[VertexAttributeDescriptor, ...]
+    offsets: tuple[int, ...]
+    stride: int
+    padding: tuple[tuple[int, int], ...]  # (offset, size) of unused bytes
+    dtype: np.dtype  # Output data type
+    inner_dtype: np.dtype  # Stored data type, includes offsets and padding
+    key: tuple
+
+    @classmethod
+    def get(cls, attributes: Sequence[VertexAttribute | VertexAttributeDescriptor],
+            offsets: Sequence[int] | None = None, stride: int | None = None, alignment: int = 1) -> 'VertexLayout':
+        """Returns registered layout, attributes are packed with given alignment unless offsets are provided."""
+        descriptors = tuple(attribute if isinstance(attribute, VertexAttributeDescriptor) else attribute.descriptor()
+                            for attribute in attributes)
+        key = (descriptors, None if offsets is None else tuple(offsets), stride, alignment)
+        with _VERTEX_LAYOUTS_LOCK:
+            layout = _VERTEX_LAYOUTS.get(key)
+            if layout is not None:
+                _VERTEX_LAYOUTS.move_to_end(key)
+                return layout
+        layout = cls._compile(descriptors, offsets, stride, alignment, key)
+        with _VERTEX_LAYOUTS_LOCK:
+            layout = _VERTEX_LAYOUTS.setdefault(key, layout)
+            if len(_VERTEX_LAYOUTS) > MAX_CACHED_VERTEX_LAYOUTS:
+                _VERTEX_LAYOUTS.popitem(last=False)
+        return layout
+
+    @classmethod
+    def _compile(cls, attributes: tuple[VertexAttributeDescriptor, ...], offsets: Sequence[int] | None,
+                 stride: int | None, alignment: int, key: tuple) -> 'VertexLayout':
+        inner_dtypes = [attribute.inner_dtype for attribute in attributes]
+        if offsets is None:
+            offsets = []
+            offset = 0
+            for inner_dtype in inner_dtypes:
+                offset = -(-offset // alignment) * alignment
+                offsets.append(offset)
+                offset += inner_dtype.itemsize
+        elif len(offsets) != len(attributes):
+            raise ValueError(f"Expected {len(attributes)} offsets, got {len(offsets)}")
+        end = max((offset + inner_dtype.itemsize for offset, inner_dtype in zip(offsets, inner_dtypes)), default=0)
+        if stride is None:
+            stride = -(-end // alignment) * alignment
+        elif stride < end:
+            raise ValueError(f"Stride {stride} is smaller than size of attributes {end}")
+
+        padding = []
+        position = 0
+        for offset, inner_dtype in sorted(zip(offsets, inner_dtypes), key=lambda item: item[0]):
+            if offset < position:
+                raise ValueError(f"Attribute at offset {offset} overlaps previous attribute")
+            if offset > position:
+                padding.append((position, offset - position))
+            position = offset + inner_dtype.itemsize
+        if stride > position:
+            padding.append((position, stride - position))
+
+        names = [attribute.semantic_id for attribute in attributes]
+        dtype = np.dtype([(name, *attribute.type.value) for name, attribute in zip(names, attributes)])
+        inner_dtype = np.dtype({'names': names, 'formats': inner_dtypes, 'offsets': list(offsets), 'itemsize': stride})
+        return cls(attributes, tuple(offsets), stride, tuple(padding), dtype, inner_dtype, key)
+
+    def matches(self, attributes: Sequence[VertexAttribute]) -> bool:
+        """Checks if attributes are stored as described by this layout."""
+        return self.attributes == tuple(attribute.descriptor() for attribute in attributes)
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, VertexLayout) and self.key == other.key
+
+    def __repr__(self):
+        members = ', '.join(f'{attribute.semantic_id}@{offset}' for attribute, offset in
+                            zip(self.attributes, self.offsets))
+        return f'<VertexLayout {members} stride={self.stride}>'
+
+
+MAX_CACHED_VERTEX_LAYOUTS = 1024
+_VERTEX_LAYOUTS: OrderedDict[tuple, VertexLayout] = OrderedDict()
+_VERTEX_LAYOUTS_LOCK = threading.Lock()
+
 
 @dataclass
 class VertexBuffer:
@@ -140,85 +417,150 @@ class VertexBuffer:
     interleaved: bool = field(default=True)
     data: bytes | None = field(
         default=None)  # Optional storage, will be used for interleaved vertex data if no argument for read_vertices provided
+    # Optional, packed layout of attributes is used by default. Attributes are created from layout when not provided,
+    # layouts with converted attributes require attributes with converters
+    layout: VertexLayout | None = field(default=None)
 
     def add_attribute(self, semantic: VertexAttributeSemantic,
                       type: VertexAttributeType,
                       inner_type: VertexAttributeType | None = None,
                       converter: Callable[[np.ndarray], np.ndarray] | None = None,
-                      size: int | None = None):
+                      size: int | None = None,
+                      data: np.ndarray | bytes | None = None,
+                      offset: int = 0,
+                      stride: int | None = None):
         """Adds an attribute to the vertex buffer."""
-        self.attributes.append(VertexAttribute(semantic, type, inner_type, converter, size))
+        self.attributes.append(VertexAttribute(semantic, type, inner_type, converter, size, data, offset, stride))
 
     def has_attribute(self, semantic: VertexAttributeSemantic):
         """Checks if the vertex buffer has the specified attribute."""
         return any(attr.semantic == semantic for attr in self.attributes)
 
-    def read_vertices(self, count: int, data: bytes | None = None):
-        """Reads vertex data from the buffer or from attributes own buffers for non-interleaved vertex data."""
-        if data is None and self.data is None:
-            raise ValueError("No data provided to read from: argument data is None and self.data is None")
-        data = data or self.data
-        if self.stride * count != len(data):
-            raise ValueError(f"Data length {len(data)} does not match expected size {self.stride} * {count}")
-        output_buffer = np.empty(count, dtype=self.dtype)
+    def read_vertices(self, count: int, data: bytes | None = None, as_dict: bool = False):
+        """Reads vertex data from the buffer or from attributes own buffers for non-interleaved vertex data.
+
+        Returns structured array or dict of per-semantic arrays when as_dict is set. Attributes without converter
+        are returned as zero-copy views of the data when possible, new arrays are allocated only for converted
+        attributes and for structured output of non-interleaved vertex data.
+        For non-interleaved vertex data, attributes without own data are read from shared data at their offset.
+        """
+        if data is None:
+            data = self.data
         if self.interleaved:
-            if all(attr.type == attr.inner_type for attr in self.attributes):
-                return np.frombuffer(data, dtype=self.dtype)
-            raw_data = np.frombuffer(data, dtype=self._inner_dtype)
-            for attribute in self.attributes:
-                if attribute.type != attribute.inner_type:
-                    if attribute.converter is None:
-                        raise ValueError(f"Converter required for attribute {attribute.semantic}")
-
-                attribute_data = raw_data[attribute.semantic.name]
-                if attribute.converter is not None:
-                    output_buffer[attribute.semantic.name] = attribute.converter(attribute_data)
-                else:
-                    output_buffer[attribute.semantic.name] = attribute_data
+            if data is None:
+                raise ValueError("No data provided to read from: argument data is None and self.data is None")
+            if self.stride * count != memoryview(data).nbytes:
+                raise ValueError(
+                    f"Data length {memoryview(data).nbytes} does not match expected size {self.stride} * {count}")
+            layout = self.get_layout()
+            raw_data = np.frombuffer(data, dtype=layout.inner_dtype, count=count)
+            stored = {attribute.semantic.id(): raw_data[attribute.semantic.id()] for attribute in self.attributes}
+            if not self.has_converters():
+                if as_dict:
+                    return stored
+                return raw_data
         else:
+            stored = {}
             for attribute in self.attributes:
-                if attribute.data is None:
+                attribute_data = attribute.data if attribute.data is not None else data
+                if attribute_data is None:
                     raise ValueError(f"Attribute {attribute.semantic} has no data for non-interleaved vertex buffer")
-                if attribute.type != attribute.inner_type:
-                    if attribute.converter is None:
-                        raise ValueError(f"Converter required for attribute {attribute.semantic}")
-
-                attribute_data = np.frombuffer(data, dtype=output_buffer[attribute.semantic.name].dtype)
-                if attribute.converter is not None:
-                    output_buffer[attribute.semantic.name] = attribute.converter(attribute_data)
-                else:
-                    output_buffer[attribute.semantic.name] = attribute_data
+                stored[attribute.semantic.id()] = attribute.view(attribute_data, count, attribute.offset,
+                                                                 attribute.stride)
+
+        vertices = {attribute.semantic.id(): attribute.convert(stored[attribute.semantic.id()])
+                    for attribute in self.attributes}
+        if as_dict:
+            return vertices
+        output_buffer = np.empty(count, dtype=self.dtype)
+        for name, values in vertices.items():
+            output_buffer[name] = values
         return output_buffer
 
-    def __post_init__(self):
+    def iter_vertices(self, buffer: Buffer, count: int, chunk_size: int = 65536,
+                      out: np.ndarray | None = None) -> Iterator[np.ndarray]:
+        """Decodes count interleaved vertices from buffer in chunks of chunk_size vertices.
+
+        Converters run per chunk, so temporary memory is bounded by chunk size. Yields decoded chunks as new
+        structured arrays or, when out is provided, writes chunks into out and yields views of it.
+
+        Example:
+            vertices = np.empty(count, vertex_buffer.dtype)
+            for _ in vertex_buffer.iter_vertices(buffer, count, out=vertices):
+                pass
+        """
         if not self.interleaved:
+            raise ValueError("Chunked reading is only supported for interleaved vertex data")
+        if out is not None and len(out) < count:
+            raise ValueError(f"Output array is too small: {len(out)} < {count}")
+        layout = self.get_layout()
+        scratch = np.empty(min(chunk_size, count) * layout.stride, np.uint8) if out is not None else None
+        for start in range(0, count, chunk_size):
+            chunk_count = min(chunk_size, count - start)
+            size = chunk_count * layout.stride
+            if scratch is not None:
+                raw = scratch[:size]
+                read = buffer.readinto(raw)
+            else:
+                raw = buffer.read(size)
+                read = len(raw)
+            if read != size:
+                raise BufferError(f"Not enough data in buffer to read {size} bytes, got {read}")
+            raw_data = np.frombuffer(raw, dtype=layout.inner_dtype, count=chunk_count)
+            if out is None:
+                if not self.has_converters():
+                    yield raw_data
+                    continue
+                chunk = np.empty(chunk_count, dtype=layout.dtype)
+            else:
+                chunk = out[start:start + chunk_count]
+            for attribute in self.attributes:
+                name = attribute.semantic.id()
+                chunk[name] = attribute.convert(raw_data[name])
+            yield chunk
+
+    def __post_init__(self):
+        if self.layout is not None:
+            if not self.attributes:
+                self.attributes = [VertexAttribute(VertexAttributeSemantic(attribute.semantic_name,
+                                                                           attribute.semantic_index),
+                                                   attribute.type, attribute.inner_type, size=attribute.size)
+                                   for attribute in self.layout.attributes]
+            elif not self.layout.matches(self.attributes):
+                raise ValueError("Attributes do not match provided layout")
+        self._layout_attributes = tuple(self.attributes)
+        if not self.interleaved and self.data is None:
             for attribute in self.attributes:
                 if attribute.data is None:
                     raise ValueError("Data must be provided for non-interleaved vertex buffer")
 
-    @cached_property
+    def has_converters(self) -> bool:
+        return any(attribute.converter is not None for attribute in self.attributes)
+
+    def get_layout(self) -> VertexLayout:
+        """Returns layout of the vertex buffer, layout is rebuilt only when attributes were changed."""
+        layout = self.layout
+        attributes = self._layout_attributes
+        if (layout is None or len(attributes) != len(self.attributes) or
+                any(a is not b for a, b in zip(attributes, self.attributes))):
+            # Attributes were changed, explicit offsets of previous layout can't be kept
+            layout = self.layout = VertexLayout.get(self.attributes)
+            self._layout_attributes = tuple(self.attributes)
+        return layout
+
+    @property
     def stride(self):
-        return sum(
-            attr.size if attr.inner_type == VertexAttributeType.Custom else
-            np.prod(attr.type.value[1]) * np.dtype(attr.type.value[0]).itemsize
-            for attr in self.attributes
-        )
+        return self.get_layout().stride
 
     @property
     def dtype(self):
         """Returns the data type of the vertex buffer."""
-        members = []
-        for attribute in self.attributes:
-            members.append((attribute.semantic.id(), *attribute.type.value))
-        return np.dtype(members)
+        return self.get_layout().dtype
 
     @property
     def _inner_dtype(self):
         """Returns the inner data type of the vertex buffer."""
-        members = []
-        for attribute in self.attributes:
-            members.append((attribute.semantic.id(), *attribute.inner_type.value))
-        return np.dtype(members)
+        return self.get_layout().inner_dtype
 
 
 if __name__ == '__main__':
@@ -0,0 +1,78 @@
+from typing import Sequence
+
+import numpy as np
+
+from UniLoader.common_api.vertex_buffer import VertexAttributeSemantic
+
+
+def _key_rows(vertices: np.ndarray, names: list[str]) -> np.ndarray:
+    """Packs compared fields of every vertex into zero padded row of uint64 words."""
+    formats = [vertices.dtype.fields[name][0] for name in names]
+    offsets = []
+    size = 0
+    for field_dtype in formats:
+        offsets.append(size)
+        size += field_dtype.itemsize
+    words = max(-(-size // 8), 1)
+    packed = np.zeros(len(vertices), np.dtype({'names': names, 'formats': formats, 'offsets': offsets,
+                                               'itemsize': words * 8}))
+    for name in names:
+        packed[name] = vertices[name]
+    return packed.view(np.uint64).reshape(len(vertices), words)
+
+
+def _hash_rows(rows: np.ndarray) -> np.ndarray:
+    hashes = np.zeros(len(rows), np.uint64)
+    for word in range(rows.shape[1]):
+        hashes ^= rows[:, word]
+        hashes *= np.uint64(0x9E3779B97F4A7C15)
+        hashes ^= hashes >> np.uint64(29)
+    return hashes
+
+
+def _group_starts(sorted_rows: np.ndarray) -> np.ndarray:
+    starts = np.empty(len(sorted_rows), bool)
+    starts[:1] = True
+    np.any(sorted_rows[1:] != sorted_rows[:-1], axis=1, out=starts[1:])
+    return starts
+
+
+def weld_vertices(vertices: np.ndarray, indices: np.ndarray,
+                  ignore: Sequence[VertexAttributeSemantic | str] = ()) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Merges vertices with byte-identical attributes.
+
+    vertices: structured array as returned by VertexBuffer.read_vertices.
+    indices: indices into vertices of any shape, for example (N, 3) faces.
+    ignore: semantics that are not compared, welded vertex keeps values of first merged vertex(e.g. UV seams).
+
+    Returns welded vertices in order of first occurrence, remapped indices and inverse map
+    from original vertex index to welded vertex index.
+    Comparison is exact and byte-level, so 0.0 and -0.0 are considered different.
+    """
+    ignored = {semantic if isinstance(semantic, str) else semantic.id() for semantic in ignore}
+    names = [name for name in vertices.dtype.names if name not in ignored]
+    count = len(vertices)
+    if count == 0:
+        return vertices.copy(), indices.copy(), np.empty(0, np.intp)
+
+    rows = _key_rows(vertices, names)
+    hashes = _hash_rows(rows)
+    order = np.argsort(hashes, kind='stable')
+    sorted_hashes = hashes[order]
+    sorted_rows = rows[order]
+    starts = _group_starts(sorted_rows)
+    if np.any(~starts[1:] & (sorted_hashes[1:] != sorted_hashes[:-1])) or np.any(
+            starts[1:] & (sorted_hashes[1:] == sorted_hashes[:-1])):
+        # Hash collision, fall back to exact sort of whole rows
+        order = np.lexsort(rows.T[::-1])
+        starts = _group_starts(rows[order])
+
+    groups = np.empty(count, np.intp)
+    groups[order] = np.cumsum(starts) - 1
+    first = order[starts]  # Sort is stable, so first element of each group is its first occurrence
+    first_order = np.argsort(first)
+    rank = np.empty_like(first_order)
+    rank[first_order] = np.arange(len(first_order))
+    remap = rank[groups]
+    welded_indices = remap[indices].astype(indices.dtype, copy=False)
+    return vertices[first[first_order]], welded_indices, remap
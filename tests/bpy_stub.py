@@ -0,0 +1,105 @@
+"""Lightweight stand-in for the parts of bpy used by common_api.mesh_utils, for running and benchmarking headless.
+
+Collections keep their properties in numpy arrays and mimic add/foreach_set/foreach_get, including the size check
+Blender does in foreach_set.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+
+
+class PropertyCollection:
+    def __init__(self, properties: dict[str, tuple[type, tuple[int, ...]]]):
+        self.properties = {name: np.zeros((0, *shape), dtype) for name, (dtype, shape) in properties.items()}
+
+    def __len__(self):
+        return len(next(iter(self.properties.values())))
+
+    def add(self, count: int):
+        self.properties = {name: np.concatenate([values, np.zeros((count, *values.shape[1:]), values.dtype)])
+                           for name, values in self.properties.items()}
+
+    def foreach_set(self, name: str, values):
+        values = np.asarray(values)
+        target = self.properties[name]
+        if values.size != target.size:
+            raise RuntimeError(f"foreach_set({name!r}): expected {target.size} values, got {values.size}")
+        target[...] = values.reshape(target.shape)
+
+    def foreach_get(self, name: str, values: np.ndarray):
+        values[...] = self.properties[name].reshape(values.shape)
+
+
+class LoopLayer:
+    def __init__(self, loop_count: int, name: str, components: int):
+        self.data = PropertyCollection({name: (np.float32, (components,))})
+        self.data.add(loop_count)
+
+
+class LoopLayers(dict):
+    def __init__(self, mesh: 'Mesh', property_name: str, components: int):
+        super().__init__()
+        self._mesh = mesh
+        self._property_name = property_name
+        self._components = components
+
+    def new(self, name: str) -> LoopLayer:
+        layer = self[name] = LoopLayer(len(self._mesh.loops), self._property_name, self._components)
+        return layer
+
+
+class Mesh:
+    def __init__(self, name: str):
+        self.name = name
+        self.vertices = PropertyCollection({'co': (np.float32, (3,))})
+        self.loops = PropertyCollection({'vertex_index': (np.int32, ())})
+        self.polygons = PropertyCollection({'loop_start': (np.int32, ()), 'loop_total': (np.int32, ()),
+                                            'use_smooth': (np.bool_, ())})
+        self.uv_layers = LoopLayers(self, 'uv', 2)
+        self.vertex_colors = LoopLayers(self, 'color', 4)
+        self.use_auto_smooth = False
+        self.custom_normals = None
+        self.edges_calculated = False
+
+    def update(self, calc_edges: bool = False):
+        self.edges_calculated = self.edges_calculated or calc_edges
+
+    def normals_split_custom_set_from_vertices(self, normals):
+        normals = np.asarray(normals)
+        if normals.shape != (len(self.vertices), 3):
+            raise RuntimeError(f"Expected {len(self.vertices)} normals, got {normals.shape}")
+        self.custom_normals = normals
+
+    def normals_split_custom_set(self, normals):
+        self.custom_normals = np.asarray(normals)
+
+
+class VertexGroup:
+    def __init__(self, name: str):
+        self.name = name
+        self.weights: dict[int, float] = {}
+        self.add_calls = 0
+
+    def add(self, index: list[int], weight: float, type: str):
+        if type != 'REPLACE':
+            raise NotImplementedError(type)
+        self.add_calls += 1
+        for vertex in index:
+            self.weights[int(vertex)] = float(weight)
+
+
+class VertexGroups(dict):
+    def new(self, name: str) -> VertexGroup:
+        group = self[name] = VertexGroup(name)
+        return group
+
+
+class Object:
+    def __init__(self, data=None):
+        self.data = data
+        self.vertex_groups = VertexGroups()
+
+
+app = SimpleNamespace(version=(4, 2, 0))
+data = SimpleNamespace(meshes=SimpleNamespace(new=Mesh))
+types = SimpleNamespace(Mesh=Mesh, Object=Object)
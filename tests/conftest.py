@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import bpy_stub
+
+REPOSITORY_ROOT = Path(__file__).parent.parent
+
+# Addon __init__ registers Blender operators, expose UniLoader and common_api as bare packages instead,
+# so their submodules can be imported without Blender and native libraries
+sys.modules.setdefault('bpy', bpy_stub)
+for _name, _path in (('UniLoader', REPOSITORY_ROOT), ('UniLoader.common_api', REPOSITORY_ROOT / 'common_api')):
+    if _name not in sys.modules:
+        _package = ModuleType(_name)
+        _package.__path__ = [str(_path)]
+        sys.modules[_name] = _package
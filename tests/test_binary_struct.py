@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+from UniLoader.common_api.binary_struct import Array, FixedString, FourCC, binary_struct, uint16, uint32
+from UniLoader.common_api.buffer_api import MemoryBuffer, WritableMemoryBuffer
+
+
+@binary_struct
+@dataclass
+class _Tagged:
+    magic: FourCC
+    tags: Array(FixedString(4), 2)
+    flags: uint16
+    values: Array(uint32, 2)
+
+
+def _tagged_records(count: int) -> bytes:
+    buffer = WritableMemoryBuffer()
+    for index in range(count):
+        _Tagged('TAG', ['abcd', f'e{index:03}'], index, (index, index * 2)).to_buffer(buffer)
+    return bytes(buffer.getbuffer())
+
+
+def test_record_path_matches_from_buffer():
+    data = _tagged_records(3)
+    expected = [_Tagged.from_buffer(buffer) for buffer in [MemoryBuffer(data)] for _ in range(3)]
+    records = MemoryBuffer(data).read_structure_array(3, _Tagged)
+
+    assert list(records) == expected
+    assert records[1] == _Tagged('TAG', ['abcd', 'e001'], 1, (1, 2))
@@ -0,0 +1,53 @@
+import io
+
+import numpy as np
+import pytest
+
+from UniLoader.common_api.bit_reader import BitReader
+from UniLoader.common_api.buffer_api import MemoryBuffer
+
+
+class _ForwardOnlyBuffer(MemoryBuffer):
+    """Rejects backward seeks like StreamingDecompressionBuffer does."""
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET and offset < self.tell():
+            raise io.UnsupportedOperation(f"Can't seek back to {offset}")
+        return super().seek(offset, whence)
+
+
+def _encode_varints(values) -> bytes:
+    data = bytearray()
+    for value in values:
+        while True:
+            byte = value & 0x7F
+            value >>= 7
+            if value:
+                data.append(byte | 0x80)
+            else:
+                data.append(byte)
+                break
+    return bytes(data)
+
+
+def test_read_varint_array_on_forward_only_stream():
+    rng = np.random.default_rng(0)
+    values = (rng.integers(0, 1 << 63, 20_000, np.uint64) >> rng.integers(0, 63, 20_000).astype(np.uint64))
+    trailer = b'\x01\x02\x03'
+    buffer = _ForwardOnlyBuffer(_encode_varints(values.tolist()) + trailer)
+
+    np.testing.assert_array_equal(BitReader(buffer).read_varint_array(len(values)), values)
+    assert buffer.read() == trailer
+
+
+def test_read_varint_array_zigzag():
+    values = [0, -1, 1, -64, 64, -(1 << 40), (1 << 40)]
+    encoded = _encode_varints([((value << 1) ^ (value >> 63)) & ((1 << 64) - 1) for value in values])
+
+    np.testing.assert_array_equal(BitReader(MemoryBuffer(encoded)).read_varint_array(len(values), zigzag=True),
+                                  values)
+
+
+def test_read_varint_array_truncated():
+    with pytest.raises(BufferError):
+        BitReader(MemoryBuffer(_encode_varints([1, 300]) + b'\x80')).read_varint_array(3)
@@ -0,0 +1,86 @@
+import struct
+
+import pytest
+
+from UniLoader.common_api.buffer_api import FileBuffer, MemoryBuffer, WritableMemoryBuffer
+
+
+_DATA = bytes(range(16))
+_MEMORY_BUFFERS = [lambda: MemoryBuffer(_DATA), lambda: WritableMemoryBuffer(_DATA),
+                   lambda: MemoryBuffer(bytes(4) + _DATA).sub_buffer(4, 16)]
+
+
+@pytest.mark.parametrize('factory', _MEMORY_BUFFERS)
+@pytest.mark.parametrize('offset', [-4, 17])
+def test_positional_reads_reject_out_of_bounds_offsets(factory, offset):
+    buffer = factory()
+    with pytest.raises(BufferError):
+        buffer.read_at(offset, 2)
+    with pytest.raises(BufferError):
+        buffer.read_uint16_at(offset)
+
+
+@pytest.mark.parametrize('factory', _MEMORY_BUFFERS)
+def test_positional_reads_within_bounds(factory):
+    buffer = factory()
+    assert buffer.read_at(12, 2) == b'\x0c\x0d'
+    assert buffer.read_at(16, 2) == b''
+    assert buffer.read_uint16_at(0) == 0x100
+    assert buffer.tell() == 0
+
+
+def _string_records(count: int) -> bytes:
+    return b''.join(f'name_{index}'.encode('ascii') + b'\x00' + struct.pack('<I', index) for index in range(count))
+
+
+def test_readahead_survives_string_reads(tmp_path):
+    count = 100_000
+    path = tmp_path / 'records.bin'
+    path.write_bytes(_string_records(count))
+    with FileBuffer(path) as buffer:
+        buffer.enable_readahead(64 * 1024, 4)
+        for index in range(count):
+            assert buffer.read_ascii_string() == f'name_{index}'
+            assert buffer.read_uint32() == index
+        stats = buffer.readahead_stats
+    assert stats['active']
+    assert stats['blocks'] == -(-path.stat().st_size // (64 * 1024))
+
+
+def test_readahead_survives_peeks(tmp_path):
+    record = struct.pack('<I', 0xDEADBEEF) + bytes(range(14))
+    path = tmp_path / 'peeks.bin'
+    path.write_bytes(record * 20_000)
+    with FileBuffer(path) as buffer:
+        buffer.enable_readahead(64 * 1024, 4)
+        while buffer.remaining():
+            assert buffer.peek_uint32() == 0xDEADBEEF
+            assert buffer.read(4) == record[:4]
+            assert buffer.read(14) == record[4:]
+        assert buffer.readahead_stats['active']
+
+
+def test_readahead_stops_after_seeking_back_past_retained_blocks(tmp_path):
+    data = bytes(range(256)) * 4096
+    path = tmp_path / 'scan.bin'
+    path.write_bytes(data)
+    with FileBuffer(path) as buffer:
+        buffer.enable_readahead(64 * 1024, 2)
+        assert buffer.read(256 * 1024) == data[:256 * 1024]
+        buffer.seek(10)
+        assert buffer.read(16) == data[10:26]
+        assert not buffer.readahead_stats['active']
+
+
+@pytest.mark.parametrize('offset', [0, 65530, 65536 * 3 - 3])
+def test_readahead_reads_across_block_boundary_after_seek_back(tmp_path, offset):
+    data = bytes(range(256)) * 1024
+    path = tmp_path / 'boundary.bin'
+    path.write_bytes(data)
+    with FileBuffer(path) as buffer:
+        buffer.enable_readahead(64 * 1024, 4)
+        buffer.seek(offset)
+        buffer.read(64 * 1024)
+        buffer.seek(offset + 10)
+        assert buffer.read(64) == data[offset + 10:offset + 74]
+        assert buffer.readahead_stats['active']
@@ -0,0 +1,27 @@
+import pytest
+
+from UniLoader.common_api.buffer_api import MemoryBuffer
+from UniLoader.common_api.buffer_trace import BufferTracer
+
+
+def test_positional_reads_with_keyword_arguments():
+    buffer = MemoryBuffer(bytes(range(16)))
+    with BufferTracer(record_call_sites=False) as tracer:
+        assert buffer.read_at(offset=0, size=2) == b'\x00\x01'
+        assert buffer.read_at(1, size=2) == b'\x01\x02'
+        assert buffer.unpack_at('H', offset=4) == (0x504,)
+        assert buffer.read_ascii_string(length=3) == '\x01\x02'
+
+    stats = tracer.stats['MemoryBuffer']
+    assert stats.reads == 4
+    assert stats.bytes_read == 2 + 2 + 2 + 3
+    assert stats.rereads == 2
+    assert [event[5:7] for event in tracer.events] == [(0, 2), (1, 2), (4, 2), (0, 3)]
+
+
+def test_tracer_does_not_change_errors_of_traced_calls():
+    buffer = MemoryBuffer(bytes(16))
+    with BufferTracer(record_call_sites=False) as tracer:
+        with pytest.raises(TypeError):
+            buffer.read_at(offset=0, length=2)
+    assert 'MemoryBuffer' not in tracer.stats
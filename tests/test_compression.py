@@ -0,0 +1,35 @@
+import pytest
+
+from UniLoader.common_api.buffer_api import MemoryBuffer
+
+try:
+    from UniLoader.common_api import compression
+except OSError as ex:  # TextureDecoder native library can't be loaded on this machine
+    pytest.skip(f"TextureDecoder is not available: {ex}", allow_module_level=True)
+
+_LZ4_FRAME_MAGIC = b'\x04\x22\x4d\x18'
+
+
+@pytest.mark.parametrize('codec', ['lz4', 'zstd'])
+def test_empty_stream_decompresses_to_nothing(codec):
+    if codec == 'zstd' and not compression.has_zstd_stream_support():
+        pytest.skip("TextureDecoder was built without zstd streaming API")
+    assert list(compression.decompress_stream([], codec)) == []
+    assert list(compression.decompress_stream([b''], codec)) == []
+    assert compression.StreamingDecompressionBuffer(MemoryBuffer(b''), codec).read() == b''
+
+
+def test_truncated_stream_is_reported():
+    with pytest.raises(ValueError, match='Truncated'):
+        list(compression.decompress_stream([_LZ4_FRAME_MAGIC], 'lz4'))
+
+
+def test_unknown_codec_is_reported_on_construction():
+    with pytest.raises(ValueError, match='Unknown codec'):
+        compression.StreamingDecompressionBuffer(MemoryBuffer(b''), 'brotli')
+
+
+def test_missing_zstd_stream_support_is_reported_on_construction(monkeypatch):
+    monkeypatch.setattr(compression, 'has_zstd_stream_support', lambda: False)
+    with pytest.raises(NotImplementedError):
+        compression.StreamingDecompressionBuffer(MemoryBuffer(b''), 'zstd')
@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+
+import bpy_stub
+from UniLoader.common_api.mesh_utils import add_weights, add_weights_from_vertices, build_mesh
+from UniLoader.common_api.vertex_buffer import (VertexAttribute, VertexAttributeSemantic, VertexAttributeType,
+                                                VertexBuffer)
+
+FACES = np.array([[0, 1, 2], [0, 2, 3]], np.uint16)
+
+
+def _quad_vertex_buffer() -> VertexBuffer:
+    return VertexBuffer([
+        VertexAttribute(VertexAttributeSemantic.Position, VertexAttributeType.Vector3),
+        VertexAttribute(VertexAttributeSemantic.Normal, VertexAttributeType.Vector3),
+        VertexAttribute(VertexAttributeSemantic.UV0, VertexAttributeType.Vector2),
+        VertexAttribute(VertexAttributeSemantic.Color0, VertexAttributeType.UByte4),
+    ])
+
+
+def _quad_vertices() -> np.ndarray:
+    vertices = np.zeros(4, _quad_vertex_buffer().dtype)
+    vertices['POSITION'] = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]
+    vertices['NORMAL'] = [0, 0, 1]
+    vertices['UV0'] = [[0, 0], [1, 0], [1, 0.25], [0, 1]]
+    vertices['COLOR0'] = [[255, 0, 0, 255], [0, 255, 0, 255], [0, 0, 255, 255], [51, 51, 51, 0]]
+    return vertices
+
+
+@pytest.mark.parametrize('use_layout', [False, True])
+def test_build_mesh_geometry(use_layout):
+    vertices = _quad_vertices()
+    layout = _quad_vertex_buffer().get_layout() if use_layout else None
+    mesh = build_mesh('quad', vertices, FACES, layout)
+
+    np.testing.assert_array_equal(mesh.vertices.properties['co'], vertices['POSITION'])
+    np.testing.assert_array_equal(mesh.loops.properties['vertex_index'], FACES.ravel())
+    np.testing.assert_array_equal(mesh.polygons.properties['loop_start'], [0, 3])
+    assert mesh.edges_calculated
+    np.testing.assert_array_equal(mesh.custom_normals, vertices['NORMAL'])
+
+
+def test_build_mesh_sets_loop_total_before_blender_4(monkeypatch):
+    monkeypatch.setattr(bpy_stub.app, 'version', (3, 6, 0))
+    mesh = build_mesh('quad', _quad_vertices(), FACES)
+    np.testing.assert_array_equal(mesh.polygons.properties['loop_total'], [3, 3])
+
+
+@pytest.mark.parametrize('flip_uv', [True, False])
+def test_build_mesh_uv(flip_uv):
+    vertices = _quad_vertices()
+    mesh = build_mesh('quad', vertices, FACES, flip_uv=flip_uv)
+
+    expected = vertices['UV0'][FACES.ravel()].copy()
+    if flip_uv:
+        expected[:, 1] = 1 - expected[:, 1]
+    np.testing.assert_allclose(mesh.uv_layers['UV0'].data.properties['uv'], expected)
+
+
+def test_build_mesh_normalizes_integer_colors():
+    vertices = _quad_vertices()
+    mesh = build_mesh('quad', vertices, FACES)
+
+    expected = vertices['COLOR0'][FACES.ravel()] / 255
+    np.testing.assert_allclose(mesh.vertex_colors['COLOR0'].data.properties['color'], expected, rtol=1e-6)
+
+
+def test_build_mesh_pads_rgb_colors_with_alpha():
+    vertex_buffer = VertexBuffer([
+        VertexAttribute(VertexAttributeSemantic.Position, VertexAttributeType.Vector3),
+        VertexAttribute(VertexAttributeSemantic.Color1, VertexAttributeType.Vector3),
+    ])
+    vertices = np.zeros(4, vertex_buffer.dtype)
+    vertices['COLOR1'] = 0.5
+    mesh = build_mesh('quad', vertices, FACES)
+
+    np.testing.assert_allclose(mesh.vertex_colors['COLOR1'].data.properties['color'], [[0.5, 0.5, 0.5, 1]] * 6)
+
+
+def test_build_mesh_requires_position():
+    vertices = np.zeros(4, [('NORMAL', np.float32, (3,))])
+    with pytest.raises(ValueError):
+        build_mesh('quad', vertices, FACES)
+
+
+def _weights(mesh_obj: bpy_stub.Object) -> dict[tuple[int, str], float]:
+    return {(vertex, name): weight for name, group in mesh_obj.vertex_groups.items()
+            for vertex, weight in group.weights.items()}
+
+
+def test_add_weights_sums_duplicates_and_drops_zeros():
+    mesh_obj = bpy_stub.Object()
+    bone_indices = np.array([[0, 0, 1, 2], [1, 2, 2, 0]])
+    bone_weights = np.array([[0.25, 0.25, 0.5, 0.0], [1.0, 0.0, 0.0, 0.0]], np.float32)
+    add_weights(bone_indices, bone_weights, ['a', 'b', 'c'], mesh_obj)
+
+    assert _weights(mesh_obj) == {(0, 'a'): 0.5, (0, 'b'): 0.5, (1, 'b'): 1.0}
+    assert list(mesh_obj.vertex_groups) == ['a', 'b', 'c']
+
+
+def test_add_weights_groups_add_calls_by_bone_and_weight():
+    mesh_obj = bpy_stub.Object()
+    vertex_count = 1000
+    bone_indices = np.tile([[0, 1]], (vertex_count, 1))
+    bone_weights = np.tile(np.array([[0.75, 0.25]], np.float32), (vertex_count, 1))
+    add_weights(bone_indices, bone_weights, ['a', 'b'], mesh_obj)
+
+    assert sum(group.add_calls for group in mesh_obj.vertex_groups.values()) == 2
+    assert len(_weights(mesh_obj)) == vertex_count * 2
+
+
+def test_add_weights_remap_and_normalize():
+    mesh_obj = bpy_stub.Object()
+    add_weights(np.array([[0, 1], [1, 0]]), np.array([[2, 2], [3, 0]], np.float32), ['x', 'y'], mesh_obj,
+                bone_remap=np.array([1, 0]), normalize=True)
+
+    assert _weights(mesh_obj) == {(0, 'y'): 0.5, (0, 'x'): 0.5, (1, 'x'): 1.0}
+
+
+def test_add_weights_rejects_out_of_range_bones():
+    with pytest.raises(ValueError):
+        add_weights(np.array([[3]]), np.array([[1.0]]), ['a'], bpy_stub.Object())
+
+
+def test_add_weights_from_vertices_stacks_influences():
+    vertex_buffer = VertexBuffer([
+        VertexAttribute(VertexAttributeSemantic.Position, VertexAttributeType.Vector3),
+        VertexAttribute(VertexAttributeSemantic.BoneIndices0, VertexAttributeType.UByte4),
+        VertexAttribute(VertexAttributeSemantic.BoneWeights0, VertexAttributeType.UByte4),
+        VertexAttribute(VertexAttributeSemantic.BoneIndices1, VertexAttributeType.UByte4),
+        VertexAttribute(VertexAttributeSemantic.BoneWeights1, VertexAttributeType.UByte4),
+    ])
+    vertices = np.zeros(2, vertex_buffer.dtype)
+    vertices['BONE_INDICES0'] = [[0, 1, 2, 3], [0, 0, 0, 0]]
+    vertices['BONE_WEIGHT0'] = [[51, 51, 51, 51], [255, 0, 0, 0]]
+    vertices['BONE_INDICES1'] = [[4, 5, 6, 7], [0, 0, 0, 0]]
+    vertices['BONE_WEIGHT1'] = [[0, 0, 0, 51], [0, 0, 0, 0]]
+    mesh_obj = bpy_stub.Object()
+    add_weights_from_vertices(vertices, [f'bone{index}' for index in range(8)], mesh_obj)
+
+    weights = _weights(mesh_obj)
+    assert set(weights) == {(0, f'bone{index}') for index in (0, 1, 2, 3, 7)} | {(1, 'bone0')}
+    assert weights[(0, 'bone7')] == pytest.approx(0.2)
+    assert weights[(1, 'bone0')] == pytest.approx(1.0)
+
+
+def test_add_weights_from_vertices_requires_bone_fields():
+    with pytest.raises(ValueError, match='BONE_INDICES'):
+        add_weights_from_vertices(_quad_vertices(), ['a'], bpy_stub.Object())
+
+
+
+def test_add_weights_remaps_only_used_influences():
+    mesh_obj = bpy_stub.Object()
+    add_weights(np.array([[0, 255], [1, 255]]), np.array([[1, 0], [1, 0]], np.float32), ['a', 'b'], mesh_obj,
+                bone_remap=np.array([1, 0]))
+
+    assert _weights(mesh_obj) == {(0, 'b'): 1.0, (1, 'a'): 1.0}
+
+
+def test_add_weights_rejects_bones_outside_of_remap():
+    with pytest.raises(ValueError, match='remap'):
+        add_weights(np.array([[2]]), np.array([[1.0]]), ['a', 'b', 'c'], bpy_stub.Object(), bone_remap=np.array([1, 0]))
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from UniLoader.common_api.vertex_buffer import (dequantize, dequantize_submeshes, octahedral_to_vector3,
+                                                snorm_10_10_10_2_to_float, snorm_to_float, unorm_10_10_10_2_to_float,
+                                                unorm_to_float)
+
+
+def _pack_10_10_10_2(components) -> np.ndarray:
+    components = np.asarray(components, np.uint32)
+    return (components[:, 0] & 0x3FF) | (components[:, 1] & 0x3FF) << 10 | (components[:, 2] & 0x3FF) << 20 | \
+        (components[:, 3] & 0x3) << 30
+
+
+def _octahedral_encode(normals: np.ndarray) -> np.ndarray:
+    encoded = normals[:, :2] / np.abs(normals).sum(axis=1, keepdims=True)
+    lower = normals[:, 2] < 0
+    signs = np.where(encoded[lower] >= 0, 1.0, -1.0)
+    encoded[lower] = (1 - np.abs(encoded[lower][:, ::-1])) * signs
+    return encoded
+
+
+@pytest.mark.parametrize('dtype', [np.int8, np.int16])
+def test_snorm_endpoints(dtype):
+    info = np.iinfo(dtype)
+    values = np.array([info.min, info.min + 1, 0, info.max], dtype)
+    np.testing.assert_array_equal(snorm_to_float(values), [-1, -1, 0, 1])
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16])
+def test_unorm_endpoints(dtype):
+    values = np.array([0, np.iinfo(dtype).max], dtype)
+    np.testing.assert_array_equal(unorm_to_float(values), [0, 1])
+
+
+def test_unorm_10_10_10_2_reference_values():
+    packed = np.array([0xC00003FF, 0x00000000, 0x7FF00200], np.uint32)
+    expected = [[1, 0, 0, 1], [0, 0, 0, 0], [512 / 1023, 0, 1, 1 / 3]]
+    np.testing.assert_allclose(unorm_10_10_10_2_to_float(packed), expected, rtol=1e-6)
+    np.testing.assert_allclose(unorm_10_10_10_2_to_float(packed.view('V4')), expected, rtol=1e-6)
+
+
+def test_snorm_10_10_10_2_reference_values():
+    packed = _pack_10_10_10_2([[511, 0x200, 0x3FF, 1], [0x201, 256, 0, 2], [0, 0, 0, 3]])
+    expected = [[1, -1, -1 / 511, 1], [-1, 256 / 511, 0, -1], [0, 0, 0, -1]]
+    np.testing.assert_allclose(snorm_10_10_10_2_to_float(packed), expected, rtol=1e-6)
+
+
+def test_octahedral_round_trip_covers_both_hemispheres():
+    rng = np.random.default_rng(0)
+    normals = rng.normal(size=(1000, 3))
+    normals = np.concatenate([normals, [[0, 0, 1], [0, 0, -1], [1, 0, 0], [0, -1, 0], [0.6, 0, -0.8]]])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    encoded = _octahedral_encode(normals)
+    assert (normals[:, 2] < 0).sum() > 400
+
+    np.testing.assert_allclose(octahedral_to_vector3(encoded.astype(np.float32)), normals, atol=1e-6)
+    quantized = np.round(encoded * 32767).astype(np.int16)
+    np.testing.assert_allclose(octahedral_to_vector3(quantized), normals, atol=1e-4)
+    unorm = np.round((encoded + 1) / 2 * 65535).astype(np.uint16)
+    np.testing.assert_allclose(octahedral_to_vector3(unorm), normals, atol=1e-4)
+
+
+def test_dequantize():
+    values = np.array([[0, 32768, 65535]], np.uint16)
+    np.testing.assert_allclose(dequantize(2, 1)(values), [[1, 65537, 131071]])
+    np.testing.assert_allclose(dequantize([2, 4, 8], [0, -1, 1], normalized=True)(values),
+                               [[0, 4 * 32768 / 65535 - 1, 9]], rtol=1e-6)
+    np.testing.assert_allclose(dequantize(10, 0, normalized=True)(np.array([-128, 127], np.int8)), [-10, 10])
+
+
+def test_dequantize_submeshes_per_component():
+    values = np.arange(15, dtype=np.uint16).reshape(5, 3)
+    scales = np.array([[1, 2, 3], [0.5, 0.25, 2]])
+    biases = np.array([[0, 0, 0], [10, 20, 30]])
+    expected = np.concatenate([values[:2] * scales[0] + biases[0], values[2:] * scales[1] + biases[1]])
+    np.testing.assert_allclose(dequantize_submeshes(values, [2, 3], scales, biases), expected)
+
+
+def test_dequantize_submeshes_scalar_parameters_normalized():
+    values = np.array([[-128, 127], [127, 0], [0, 127]], np.int8)
+    output = dequantize_submeshes(values, [1, 2], [2, 4], [1, -1], normalized=True)
+    np.testing.assert_allclose(output, [[-1, 3], [3, -1], [-1, 3]])
+
+
+def test_dequantize_submeshes_rejects_mismatched_counts():
+    with pytest.raises(ValueError):
+        dequantize_submeshes(np.zeros((4, 3), np.uint16), [2, 3], [1, 1], [0, 0])
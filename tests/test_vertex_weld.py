@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pytest
+from numpy.lib import recfunctions
+
+from UniLoader.common_api import vertex_weld
+from UniLoader.common_api.vertex_buffer import VertexAttributeSemantic
+from UniLoader.common_api.vertex_weld import weld_vertices
+
+_VERTEX_DTYPE = np.dtype([('POSITION', np.float32, (3,)), ('NORMAL', np.int8, (4,)), ('UV0', np.float16, (2,))])
+
+
+def _reference_weld(vertices: np.ndarray, indices: np.ndarray, names: list[str]):
+    """Welds by np.unique over raw bytes of compared fields, keeping first occurrence order."""
+    compared = recfunctions.repack_fields(vertices[names])
+    keys = compared.view(f'V{compared.dtype.itemsize}')
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    remap = rank[inverse.ravel()]
+    return vertices[first[order]], remap[indices], remap
+
+
+def _random_mesh(vertex_count: int, face_count: int, seed: int = 0, index_dtype=np.uint32):
+    rng = np.random.default_rng(seed)
+    unique = np.zeros(max(vertex_count // 4, 1), _VERTEX_DTYPE)
+    unique['POSITION'] = rng.integers(-8, 8, (len(unique), 3))
+    unique['NORMAL'] = rng.integers(-1, 2, (len(unique), 4))
+    unique['UV0'] = rng.integers(0, 4, (len(unique), 2)) / 4
+    vertices = unique[rng.integers(0, len(unique), vertex_count)]
+    vertices['UV0'][rng.random(vertex_count) < 0.1] = 0.5  # UV seams
+    indices = rng.integers(0, vertex_count, (face_count, 3)).astype(index_dtype)
+    return vertices, indices
+
+
+def _assert_matches_reference(vertices, indices, ignore=(), ignored_names=()):
+    welded, welded_indices, remap = weld_vertices(vertices, indices, ignore)
+    names = [name for name in vertices.dtype.names if name not in ignored_names]
+    expected, expected_indices, expected_remap = _reference_weld(vertices, indices, names)
+
+    assert len(welded) < len(vertices)
+    np.testing.assert_array_equal(welded, expected)
+    np.testing.assert_array_equal(remap, expected_remap)
+    np.testing.assert_array_equal(welded_indices, expected_indices)
+    assert welded_indices.dtype == indices.dtype
+    np.testing.assert_array_equal(welded[remap][names], vertices[names])
+
+
+@pytest.mark.parametrize('index_dtype', [np.uint16, np.uint32, np.int64])
+def test_weld_matches_unique(index_dtype):
+    vertices, indices = _random_mesh(5000, 3000, index_dtype=index_dtype)
+    _assert_matches_reference(vertices, indices)
+
+
+@pytest.mark.parametrize('ignore', [[VertexAttributeSemantic.UV0], ['UV0']])
+def test_weld_ignores_semantics(ignore):
+    vertices, indices = _random_mesh(5000, 3000)
+    _assert_matches_reference(vertices, indices, ignore, ['UV0'])
+
+
+def test_weld_keeps_first_occurrence_order():
+    vertices = np.zeros(5, _VERTEX_DTYPE)
+    vertices['POSITION'][:, 0] = [3, 1, 3, 2, 1]
+    vertices['UV0'][:, 0] = [0, 0, 0.5, 0, 0.25]
+    indices = np.array([4, 3, 2, 1, 0], np.uint16)
+    welded, welded_indices, remap = weld_vertices(vertices, indices, ['UV0'])
+
+    np.testing.assert_array_equal(welded['POSITION'][:, 0], [3, 1, 2])
+    np.testing.assert_array_equal(welded['UV0'][:, 0], [0, 0, 0])
+    np.testing.assert_array_equal(remap, [0, 1, 0, 2, 1])
+    np.testing.assert_array_equal(welded_indices, [1, 2, 0, 1, 0])
+
+
+def test_weld_compares_bytes():
+    vertices = np.zeros(2, _VERTEX_DTYPE)
+    vertices['POSITION'][1, 0] = -0.0
+    welded, _, _ = weld_vertices(vertices, np.array([0, 1]))
+    assert len(welded) == 2
+
+
+def test_weld_falls_back_to_exact_sort_on_hash_collisions(monkeypatch):
+    monkeypatch.setattr(vertex_weld, '_hash_rows', lambda rows: np.zeros(len(rows), np.uint64))
+    vertices, indices = _random_mesh(5000, 3000)
+    _assert_matches_reference(vertices, indices)
+
+
+def test_weld_empty():
+    welded, welded_indices, remap = weld_vertices(np.zeros(0, _VERTEX_DTYPE), np.zeros((0, 3), np.uint16))
+    assert len(welded) == 0 and welded_indices.shape == (0, 3) and len(remap) == 0
+
+
+@pytest.mark.skipif(not os.environ.get('UNILOADER_LARGE_TESTS'), reason="set UNILOADER_LARGE_TESTS=1 to run")
+def test_weld_large_input():
+    vertices, indices = _random_mesh(10_000_000, 3_000_000)
+    _assert_matches_reference(vertices, indices)